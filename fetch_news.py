@@ -7,13 +7,22 @@ Enforces strict 48-hour freshness filter — only today's and yesterday's news i
 """
 
 import feedparser
-import json
+import functools
+import html
+import orjson
+import os
+import re
+import requests
 import time
 import socket
+import hashlib
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
-from bs4 import BeautifulSoup
-import urllib.request
+from pathlib import Path
+from requests.adapters import HTTPAdapter
 
 # Set global socket timeout
 socket.setdefaulttimeout(8)
@@ -21,49 +30,140 @@ socket.setdefaulttimeout(8)
 # ============================================================
 # 28 Authoritative Sources (Finance + Procurement)
 # ============================================================
-RSS_SOURCES = [
+# Rows are (name, url, category) tuples, unpacked positionally by the fetchers
+RSS_SOURCES = (
     # --- Global Markets & Finance ---
-    {"name": "Bloomberg Markets",       "url": "https://feeds.bloomberg.com/markets/news.rss",              "category": "global_markets"},
-    {"name": "Financial Times",         "url": "https://www.ft.com/rss/home",                               "category": "global_markets"},
-    {"name": "WSJ Markets",             "url": "https://feeds.a.dj.com/rss/RSSMarketsMain.xml",             "category": "global_markets"},
-    {"name": "CNBC Top News",           "url": "https://www.cnbc.com/id/100003114/device/rss/rss.html",     "category": "global_markets"},
-    {"name": "MarketWatch",             "url": "https://feeds.marketwatch.com/marketwatch/topstories/",     "category": "global_markets"},
-    {"name": "Yahoo Finance",           "url": "https://finance.yahoo.com/rss/topfinstories",               "category": "global_markets"},
-    {"name": "Barron's",                "url": "https://www.barrons.com/xml/rss/3_7201.xml",                "category": "global_markets"},
-    {"name": "Seeking Alpha",           "url": "https://seekingalpha.com/market_currents.xml",              "category": "global_markets"},
-    {"name": "Business Insider Markets","url": "https://markets.businessinsider.com/rss/news",              "category": "global_markets"},
+    ("Bloomberg Markets",        "https://feeds.bloomberg.com/markets/news.rss",                     "global_markets"),
+    ("Financial Times",          "https://www.ft.com/rss/home",                                      "global_markets"),
+    ("WSJ Markets",              "https://feeds.a.dj.com/rss/RSSMarketsMain.xml",                    "global_markets"),
+    ("CNBC Top News",            "https://www.cnbc.com/id/100003114/device/rss/rss.html",            "global_markets"),
+    ("MarketWatch",              "https://feeds.marketwatch.com/marketwatch/topstories/",            "global_markets"),
+    ("Yahoo Finance",            "https://finance.yahoo.com/rss/topfinstories",                      "global_markets"),
+    ("Barron's",                 "https://www.barrons.com/xml/rss/3_7201.xml",                       "global_markets"),
+    ("Seeking Alpha",            "https://seekingalpha.com/market_currents.xml",                     "global_markets"),
+    ("Business Insider Markets", "https://markets.businessinsider.com/rss/news",                     "global_markets"),
     # --- Macro & Research ---
-    {"name": "The Economist Finance",   "url": "https://www.economist.com/finance-and-economics/rss.xml",  "category": "macro"},
-    {"name": "IMF Blog",                "url": "https://www.imf.org/en/Blogs/rss",                         "category": "macro"},
-    {"name": "Project Syndicate",       "url": "https://www.project-syndicate.org/rss/section/finance",    "category": "macro"},
-    {"name": "World Bank Blog",         "url": "https://blogs.worldbank.org/en/rss.xml",                   "category": "macro"},
+    ("The Economist Finance",    "https://www.economist.com/finance-and-economics/rss.xml",          "macro"),
+    ("IMF Blog",                 "https://www.imf.org/en/Blogs/rss",                                 "macro"),
+    ("Project Syndicate",        "https://www.project-syndicate.org/rss/section/finance",            "macro"),
+    ("World Bank Blog",          "https://blogs.worldbank.org/en/rss.xml",                           "macro"),
     # --- Central Banks & Policy ---
-    {"name": "Federal Reserve",         "url": "https://www.federalreserve.gov/feeds/press_all.xml",       "category": "central_banks"},
-    {"name": "ECB Press Releases",      "url": "https://www.ecb.europa.eu/rss/press.html",                 "category": "central_banks"},
-    {"name": "BIS Speeches",            "url": "https://www.bis.org/rss/speeches.rss",                     "category": "central_banks"},
+    ("Federal Reserve",          "https://www.federalreserve.gov/feeds/press_all.xml",               "central_banks"),
+    ("ECB Press Releases",       "https://www.ecb.europa.eu/rss/press.html",                         "central_banks"),
+    ("BIS Speeches",             "https://www.bis.org/rss/speeches.rss",                             "central_banks"),
     # --- Commodities & Energy ---
-    {"name": "OilPrice.com",            "url": "https://oilprice.com/rss/main",                            "category": "commodities"},
-    {"name": "Reuters Commodities",     "url": "https://feeds.reuters.com/reuters/commoditiesNews",        "category": "commodities"},
+    ("OilPrice.com",             "https://oilprice.com/rss/main",                                    "commodities"),
+    ("Reuters Commodities",      "https://feeds.reuters.com/reuters/commoditiesNews",                "commodities"),
     # --- Technology & AI ---
-    {"name": "TechCrunch Fintech",      "url": "https://techcrunch.com/category/fintech/feed/",            "category": "tech"},
-    {"name": "MIT Tech Review",         "url": "https://www.technologyreview.com/feed/",                   "category": "tech"},
+    ("TechCrunch Fintech",       "https://techcrunch.com/category/fintech/feed/",                    "tech"),
+    ("MIT Tech Review",          "https://www.technologyreview.com/feed/",                           "tech"),
     # --- Asia & China ---
-    {"name": "SCMP Business",           "url": "https://www.scmp.com/rss/91/feed",                         "category": "china"},
-    {"name": "Nikkei Asia",             "url": "https://asia.nikkei.com/rss/feed/nar",                     "category": "asia"},
-    {"name": "Reuters Asia Markets",    "url": "https://feeds.reuters.com/reuters/asiaMarketsNews",        "category": "asia"},
+    ("SCMP Business",            "https://www.scmp.com/rss/91/feed",                                 "china"),
+    ("Nikkei Asia",              "https://asia.nikkei.com/rss/feed/nar",                             "asia"),
+    ("Reuters Asia Markets",     "https://feeds.reuters.com/reuters/asiaMarketsNews",                "asia"),
     # --- Digital Assets ---
-    {"name": "CoinDesk",                "url": "https://www.coindesk.com/arc/outboundfeeds/rss/",          "category": "crypto"},
+    ("CoinDesk",                 "https://www.coindesk.com/arc/outboundfeeds/rss/",                  "crypto"),
     # --- Procurement & Supply Chain ---
-    {"name": "Supply Chain Dive",       "url": "https://www.supplychaindive.com/feeds/news/",              "category": "procurement"},
-    {"name": "Procurement Magazine",    "url": "https://procurementmag.com/feed",                          "category": "procurement"},
-    {"name": "Spend Matters",           "url": "https://spendmatters.com/feed/",                           "category": "procurement"},
-    {"name": "Logistics Management",    "url": "https://www.logisticsmgmt.com/rss/all",                    "category": "procurement"},
-]
+    ("Supply Chain Dive",        "https://www.supplychaindive.com/feeds/news/",                      "procurement"),
+    ("Procurement Magazine",     "https://procurementmag.com/feed",                                  "procurement"),
+    ("Spend Matters",            "https://spendmatters.com/feed/",                                   "procurement"),
+    ("Logistics Management",     "https://www.logisticsmgmt.com/rss/all",                            "procurement"),
+)
 
 # ============================================================
 # Freshness Filter: only keep news from the last 48 hours
 # ============================================================
 FRESHNESS_HOURS = 48
+PUBLISHED_FMT = "%Y-%m-%d %H:%M UTC"
+
+# Feeds are network-bound, so fetch them concurrently
+FETCH_WORKERS = 12
+
+# Summaries are short fragments; strip tags with a regex instead of building a DOM
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+# Shared keep-alive session: one connection pool per host, reused by all workers
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = feedparser.USER_AGENT
+_adapter = HTTPAdapter(pool_connections=len(RSS_SOURCES), pool_maxsize=FETCH_WORKERS)
+_SESSION.mount("https://", _adapter)
+_SESSION.mount("http://", _adapter)
+
+# ============================================================
+# Per-feed cache: recent items plus ETag / Last-Modified validators
+# ============================================================
+FEED_CACHE_DIR = Path("feed_cache")
+FEED_CACHE_TTL = 900  # seconds; younger cache files are reused without any request
+
+
+def write_cache_file(path: Path, data: bytes):
+    """Write a cache file via temp file + os.replace, so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # pid + thread id: feeds are fetched from a thread pool
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def feed_cache_path(url: str) -> Path:
+    return FEED_CACHE_DIR / f"{hashlib.md5(url.encode('utf-8')).hexdigest()}.json"
+
+
+def load_feed_cache(path: Path) -> dict:
+    """Load the {etag, modified, items} entry saved for one feed, or {} if absent."""
+    try:
+        return orjson.loads(path.read_bytes())
+    except Exception:
+        return {}
+
+
+def save_feed_cache(path: Path, entry: dict):
+    """Persist one feed's validators and last-known items for the next run."""
+    try:
+        write_cache_file(path, orjson.dumps(entry))
+    except Exception as e:
+        print(f"  [WARN] feed cache not saved: {e}")
+
+
+# ============================================================
+# Whole-result TTL cache: lets local re-runs skip the network entirely
+# ============================================================
+RESULT_CACHE_DIR = Path(".cache")
+
+
+def ttl_cache(ttl_seconds: int, period: str, cache_dir: Path = RESULT_CACHE_DIR, cacheable=bool):
+    """Cache a function's JSON-serializable result on disk for ttl_seconds.
+
+    Entries are keyed by function name, arguments and the current UTC time
+    formatted with `period` (e.g. "%Y%m%d" for one entry per day), so a new
+    period never reuses the previous one's result even within the TTL. Only
+    results passing `cacheable` (default: non-empty) are stored, so a partial
+    or failed fetch is retried on the next run instead of being replayed.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bucket = datetime.now(timezone.utc).strftime(period)
+            key = hashlib.md5(repr((args, sorted(kwargs.items()))).encode("utf-8")).hexdigest()[:12]
+            path = Path(cache_dir) / f"{fn.__name__}_{bucket}_{key}.json"
+            try:
+                age = time.time() - path.stat().st_mtime
+                if age < ttl_seconds:
+                    print(f"[CACHE] {fn.__name__}: reusing result from {int(age)}s ago ({path})")
+                    return orjson.loads(path.read_bytes())
+            except (OSError, orjson.JSONDecodeError):
+                pass
+            result = fn(*args, **kwargs)
+            if cacheable(result):
+                try:
+                    write_cache_file(path, orjson.dumps(result))
+                except Exception as e:
+                    print(f"  [WARN] result cache not saved: {e}")
+            return result
+        return wrapper
+    return decorator
+
 
 def parse_entry_datetime(entry) -> datetime | None:
     """Try to extract a timezone-aware datetime from an RSS entry."""
@@ -101,11 +201,55 @@ def is_fresh(entry, cutoff: datetime) -> bool:
     return dt >= cutoff
 
 
-def fetch_rss_feed(source: dict, max_items: int = 6, cutoff: datetime = None) -> list:
-    """Fetch news items from a single RSS feed with timeout protection and freshness filter."""
+def is_item_fresh(item: dict, cutoff: datetime) -> bool:
+    """Freshness check for an already-built news item (e.g. replayed from the feed cache)."""
+    try:
+        dt = datetime.strptime(item["published"], PUBLISHED_FMT).replace(tzinfo=timezone.utc)
+    except Exception:
+        return True
+    return dt >= cutoff
+
+
+def replay_cached_items(cached: dict, max_items: int, cutoff: datetime = None) -> list:
+    """Return up to max_items of a cache entry's items that still pass the freshness cutoff."""
+    return [i for i in cached.get("items", []) if not cutoff or is_item_fresh(i, cutoff)][:max_items]
+
+
+def fetch_rss_feed(name: str, url: str, category: str, max_items: int = 6,
+                   cutoff: datetime = None, use_cache: bool = True) -> list:
+    """Fetch news items from a single RSS feed with timeout protection and freshness filter.
+
+    With use_cache, a cache file younger than FEED_CACHE_TTL is returned without
+    any request; otherwise the request is sent as a conditional GET and an
+    HTTP 304 replays the cached items instead of re-parsing. An entry saved with
+    a smaller max_items than requested holds too few items and is not reused.
+    This is the only news cache layer, so a feed that failed is retried on the
+    next call rather than staying missing.
+    """
     items = []
+    cache_path = feed_cache_path(url)
+    cached = load_feed_cache(cache_path) if use_cache else {}
+    if cached.get("max_items", 0) < max_items:
+        cached = {}
     try:
-        feed = feedparser.parse(source["url"])
+        if cached and time.time() - cache_path.stat().st_mtime < FEED_CACHE_TTL:
+            return replay_cached_items(cached, max_items, cutoff)
+
+        headers = {}
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("modified"):
+            headers["If-Modified-Since"] = cached["modified"]
+        resp = _SESSION.get(url, headers=headers, timeout=8)
+        if resp.status_code == 304:
+            cache_path.touch()
+            return replay_cached_items(cached, max_items, cutoff)
+        resp.raise_for_status()
+
+        # feedparser expects lower-case header names; content-location sets the base URL
+        response_headers = {k.lower(): v for k, v in resp.headers.items()}
+        response_headers["content-location"] = resp.url
+        feed = feedparser.parse(resp.content, response_headers=response_headers)
         if not feed.entries:
             return items
 
@@ -118,20 +262,20 @@ def fetch_rss_feed(source: dict, max_items: int = 6, cutoff: datetime = None) ->
             summary = entry.get("summary", entry.get("description", "")).strip()
             link = entry.get("link", "")
             pub_dt = parse_entry_datetime(entry)
-            pub_str = pub_dt.strftime("%Y-%m-%d %H:%M UTC") if pub_dt else "unknown date"
+            pub_str = pub_dt.strftime(PUBLISHED_FMT) if pub_dt else "unknown date"
 
-            # Clean HTML from summary
+            # Clean HTML from summary (many feeds already send plain text)
             if summary:
-                try:
-                    soup = BeautifulSoup(summary, "html.parser")
-                    summary = soup.get_text(separator=" ").strip()[:250]
-                except Exception:
-                    summary = summary[:250]
+                if "<" in summary:
+                    summary = _TAG_RE.sub(" ", summary)
+                if "&" in summary:
+                    summary = html.unescape(summary)
+                summary = _WS_RE.sub(" ", summary).strip()[:250]
 
             if title:
                 items.append({
-                    "source": source["name"],
-                    "category": source["category"],
+                    "source": name,
+                    "category": category,
                     "title": title,
                     "summary": summary,
                     "link": link,
@@ -141,73 +285,84 @@ def fetch_rss_feed(source: dict, max_items: int = 6, cutoff: datetime = None) ->
             if len(items) >= max_items:
                 break
 
+        if use_cache:
+            save_feed_cache(cache_path, {
+                "etag": resp.headers.get("ETag"),
+                "modified": resp.headers.get("Last-Modified"),
+                "max_items": max_items,
+                "items": items,
+            })
+
     except Exception as e:
-        print(f"  [WARN] {source['name']}: {type(e).__name__}")
+        print(f"  [WARN] {name}: {type(e).__name__}")
 
     return items
 
 
+# No whole-result cache here: a feed that failed would stay missing for the whole
+# cached period. The per-feed cache in fetch_rss_feed already makes re-runs cheap
+# (no request within FEED_CACHE_TTL, a conditional GET after) and retries failures.
 def aggregate_all_news(max_items_per_source: int = 6) -> dict:
     """Aggregate news from all sources, organized by category. Only last 48 hours."""
     cutoff = datetime.now(tz=timezone.utc) - timedelta(hours=FRESHNESS_HOURS)
     print(f"Fetching news from {len(RSS_SOURCES)} sources (cutoff: {cutoff.strftime('%Y-%m-%d %H:%M UTC')})...")
 
-    all_news = {
-        "global_markets": [],
-        "macro": [],
-        "central_banks": [],
-        "commodities": [],
-        "tech": [],
-        "china": [],
-        "asia": [],
-        "crypto": [],
-        "procurement": [],
-    }
-
     successful_sources = 0
+    results = [None] * len(RSS_SOURCES)
 
-    for i, source in enumerate(RSS_SOURCES):
-        print(f"  [{i+1:02d}/{len(RSS_SOURCES)}] {source['name']}...", end=" ", flush=True)
-        items = fetch_rss_feed(source, max_items_per_source, cutoff=cutoff)
+    # Fetch all feeds concurrently; the socket timeout above bounds stragglers
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as ex:
+        futures = {
+            ex.submit(fetch_rss_feed, name, url, cat, max_items_per_source, cutoff): i
+            for i, (name, url, cat) in enumerate(RSS_SOURCES)
+        }
+        for fut in as_completed(futures):
+            i = futures[fut]
+            items = fut.result()
+            results[i] = items
+            status = f"OK ({len(items)} fresh items)" if items else "SKIP (no fresh items)"
+            print(f"  [{i+1:02d}/{len(RSS_SOURCES)}] {RSS_SOURCES[i][0]}... {status}")
+
+    # Merge in source order so the output is deterministic; one extend per source
+    all_news = defaultdict(list)
+    for (_, _, cat), items in zip(RSS_SOURCES, results):
         if items:
-            cat = source["category"]
             all_news[cat].extend(items)
             successful_sources += 1
-            print(f"OK ({len(items)} fresh items)")
-        else:
-            print("SKIP (no fresh items)")
 
     print(f"\nSuccessfully fetched from {successful_sources}/{len(RSS_SOURCES)} sources.")
     total_items = sum(len(v) for v in all_news.values())
     print(f"Total fresh news items (last {FRESHNESS_HOURS}h): {total_items}")
     for cat, items in all_news.items():
-        if items:
-            print(f"  {cat}: {len(items)} items")
+        print(f"  {cat}: {len(items)} items")
+
+    return dict(all_news)
 
-    return all_news
+
+CATEGORY_LABELS = {
+    "global_markets": "全球市场动态",
+    "macro": "宏观经济与研究",
+    "central_banks": "央行政策动向",
+    "commodities": "大宗商品与能源",
+    "tech": "科技与AI行业",
+    "china": "中国市场",
+    "asia": "亚太市场",
+    "crypto": "数字资产",
+    "procurement": "采购与供应链",
+}
 
 
 def format_news_for_prompt(all_news: dict) -> str:
     """Format aggregated news into a structured text for the AI prompt."""
-    category_labels = {
-        "global_markets": "全球市场动态",
-        "macro": "宏观经济与研究",
-        "central_banks": "央行政策动向",
-        "commodities": "大宗商品与能源",
-        "tech": "科技与AI行业",
-        "china": "中国市场",
-        "asia": "亚太市场",
-        "crypto": "数字资产",
-        "procurement": "采购与供应链",
-    }
+    # Resolve non-empty categories once, in label order
+    active = [(label, all_news[cat]) for cat, label in CATEGORY_LABELS.items() if all_news.get(cat)]
 
     sections = []
-    for cat, label in category_labels.items():
-        items = all_news.get(cat, [])
-        if not items:
-            continue
-        section_lines = [f"\n### {label} (来源: {', '.join(set(i['source'] for i in items[:8]))})"]
-        for item in items[:8]:
+    for label, items in active:
+        top_items = items[:8]
+        sources = {i['source'] for i in top_items}
+        section_lines = [f"\n### {label} (来源: {', '.join(sources)})"]
+        for item in top_items:
             pub = item.get("published", "")
             pub_tag = f" [{pub}]" if pub and pub != "unknown date" else ""
             section_lines.append(f"- **{item['title']}**{pub_tag}")
@@ -224,6 +379,5 @@ if __name__ == "__main__":
     print("\n--- Sample of Formatted News ---")
     print(formatted[:3000])
 
-    with open("news_data.json", "w", encoding="utf-8") as f:
-        json.dump(all_news, f, ensure_ascii=False, indent=2)
+    Path("news_data.json").write_bytes(orjson.dumps(all_news, option=orjson.OPT_INDENT_2))
     print("\nNews data saved to news_data.json")
@@ -5,59 +5,62 @@ Daily Financial Report Generator - v7
 Professional investment research report format matching reference design.
 """
 
-import yfinance as yf
-import openai
-import json
+import orjson
+import functools
+import hashlib
+import itertools
 import os
 import re
+import string
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from fetch_news import aggregate_all_news, format_news_for_prompt
+from pathlib import Path
+from fetch_news import aggregate_all_news, format_news_for_prompt, ttl_cache
 
 
 # ============================================================
 # PMI Data Fetching (via Trading Economics real-time scraping)
 # ============================================================
+_PMI_VALUE_RES = (
+    re.compile(r'(?:increased|decreased|rose|fell|edged|climbed|dropped|unchanged)\s+to\s+([\d.]+)\s+points?\s+in\s+(\w+)', re.IGNORECASE),
+    re.compile(r'(?:stands?|remained?|was)\s+at\s+([\d.]+)\s+points?\s+in\s+(\w+)', re.IGNORECASE),
+    re.compile(r'([\d.]+)\s+points?\s+in\s+(\w+)', re.IGNORECASE),
+)
+_PMI_YEAR_RE = re.compile(r'of\s+(\d{4})')
+_PMI_PREV_MONTH_RE = re.compile(r'from\s+[\d.]+\s+points?\s+in\s+(\w+)\s+of', re.IGNORECASE)
+_PMI_PREV_VALUE_RE = re.compile(r'from\s+([\d.]+)\s+points?', re.IGNORECASE)
+_MONTH_NUMS = {'January': 1, 'February': 2, 'March': 3, 'April': 4, 'May': 5, 'June': 6,
+               'July': 7, 'August': 8, 'September': 9, 'October': 10, 'November': 11, 'December': 12}
+
+
 def _parse_te_pmi_description(desc: str) -> dict:
     """
     Parse Trading Economics meta description to extract PMI value, previous value, and date.
     Example: 'Manufacturing PMI in China increased to 50.30 points in January from 50.10 points in December of 2025.'
     """
-    import re
     result = {}
-    # Extract current value
-    m = re.search(r'(?:increased|decreased|rose|fell|edged|climbed|dropped|unchanged)\s+to\s+([\d.]+)\s+points?\s+in\s+(\w+)', desc, re.IGNORECASE)
-    if not m:
-        m = re.search(r'(?:stands?|remained?|was)\s+at\s+([\d.]+)\s+points?\s+in\s+(\w+)', desc, re.IGNORECASE)
-    if not m:
-        m = re.search(r'([\d.]+)\s+points?\s+in\s+(\w+)', desc, re.IGNORECASE)
+    # Extract current value (most specific phrasing first)
+    m = None
+    for pattern in _PMI_VALUE_RES:
+        m = pattern.search(desc)
+        if m:
+            break
     if m:
         result['value'] = float(m.group(1))
-        month_str = m.group(2)
-        month_map = {'January':'01','February':'02','March':'03','April':'04','May':'05','June':'06',
-                     'July':'07','August':'08','September':'09','October':'10','November':'11','December':'12'}
-        month_num = month_map.get(month_str, '01')
+        curr_month_num = _MONTH_NUMS.get(m.group(2), 1)
         # The description pattern is: "increased to X in MONTH from Y in PREV_MONTH of YEAR"
         # The year mentioned ("of 2025") refers to the PREVIOUS month, not the current month.
         # We need to infer the current month's year correctly.
-        from datetime import datetime
-        now = datetime.now()
-        yr_match = re.search(r'of\s+(\d{4})', desc)
-        prev_year = int(yr_match.group(1)) if yr_match else now.year
+        yr_match = _PMI_YEAR_RE.search(desc)
+        year = int(yr_match.group(1)) if yr_match else datetime.now().year
         # If current month number < previous month number, current month is in the next year
-        prev_month_match = re.search(r'from\s+[\d.]+\s+points?\s+in\s+(\w+)\s+of', desc, re.IGNORECASE)
-        if prev_month_match:
-            prev_month_str = prev_month_match.group(1)
-            prev_month_num = int(month_map.get(prev_month_str, '01'))
-            curr_month_num = int(month_num)
-            if curr_month_num < prev_month_num:
-                year = str(prev_year + 1)  # current month rolled over to next year
-            else:
-                year = str(prev_year)
-        else:
-            year = str(prev_year)
-        result['date'] = f"{year}-{month_num}"
+        prev_month_match = _PMI_PREV_MONTH_RE.search(desc)
+        if prev_month_match and curr_month_num < _MONTH_NUMS.get(prev_month_match.group(1), 1):
+            year += 1  # current month rolled over to next year
+        result['date'] = f"{year}-{curr_month_num:02d}"
     # Extract previous value
-    p = re.search(r'from\s+([\d.]+)\s+points?', desc, re.IGNORECASE)
+    p = _PMI_PREV_VALUE_RE.search(desc)
     if p:
         result['prev'] = float(p.group(1))
     return result
@@ -85,26 +88,35 @@ def _scrape_te_pmi(name: str, url: str) -> dict:
     return {'name': name, **parsed}
 
 
+PMI_SOURCES = [
+    ('cn_mfg',  '中国制造业PMI（官方·国家统计局）',  'https://tradingeconomics.com/china/manufacturing-pmi'),
+    ('cn_svc',  '中国非制造业PMI（官方·国家统计局）', 'https://tradingeconomics.com/china/non-manufacturing-pmi'),
+    ('cx_mfg',  '中国制造业PMI（财新·S&P Global）',  'https://tradingeconomics.com/china/caixin-manufacturing-pmi'),
+    ('cx_svc',  '中国服务业PMI（财新·S&P Global）',  'https://tradingeconomics.com/china/caixin-services-pmi'),
+    ('us_mfg',  '美国制造业PMI（ISM）',               'https://tradingeconomics.com/united-states/manufacturing-pmi'),
+    ('eu_mfg',  '欧元区制造业PMI（S&P Global）',      'https://tradingeconomics.com/euro-area/manufacturing-pmi'),
+]
+
+
+# Cached per UTC day, and only when every indicator was scraped: a partial result
+# (one page timed out or returned 403) is re-fetched on the next run instead
+@ttl_cache(ttl_seconds=86400, period="%Y%m%d", cacheable=lambda pmi: len(pmi) == len(PMI_SOURCES))
 def fetch_pmi_data() -> dict:
-    """Fetch latest PMI data from Trading Economics (real-time web scraping).
-    Data is always current - reflects the most recently published official PMI figures.
+    """Fetch latest PMI data by scraping Trading Economics.
+    A complete result is cached on disk for the rest of the UTC day, so same-day re-runs
+    reuse it; figures published later that day appear on the next day's first run.
     Sources: NBS China, Caixin/S&P Global, ISM (US), S&P Global (Euro Area)
     """
-    print("Fetching PMI data from Trading Economics (real-time)...")
+    print("Fetching PMI data from Trading Economics...")
     pmi = {}
 
-    pmi_sources = [
-        ('cn_mfg',  '中国制造业PMI（官方·国家统计局）',  'https://tradingeconomics.com/china/manufacturing-pmi'),
-        ('cn_svc',  '中国非制造业PMI（官方·国家统计局）', 'https://tradingeconomics.com/china/non-manufacturing-pmi'),
-        ('cx_mfg',  '中国制造业PMI（财新·S&P Global）',  'https://tradingeconomics.com/china/caixin-manufacturing-pmi'),
-        ('cx_svc',  '中国服务业PMI（财新·S&P Global）',  'https://tradingeconomics.com/china/caixin-services-pmi'),
-        ('us_mfg',  '美国制造业PMI（ISM）',               'https://tradingeconomics.com/united-states/manufacturing-pmi'),
-        ('eu_mfg',  '欧元区制造业PMI（S&P Global）',      'https://tradingeconomics.com/euro-area/manufacturing-pmi'),
-    ]
+    # Scrape all pages concurrently; collect in source order so the block layout is stable
+    with ThreadPoolExecutor(max_workers=len(PMI_SOURCES)) as ex:
+        futures = [(key, ex.submit(_scrape_te_pmi, name, url)) for key, name, url in PMI_SOURCES]
 
-    for key, name, url in pmi_sources:
+    for key, fut in futures:
         try:
-            row = _scrape_te_pmi(name, url)
+            row = fut.result()
             if row:
                 pmi[key] = row
                 print(f"  [PMI] {key}: {row['value']} ({row.get('date','?')})")
@@ -122,7 +134,7 @@ def build_pmi_block_html(pmi_data: dict) -> str:
     if not pmi_data:
         return ""
 
-    items_html = ""
+    parts = []
     for key, item in pmi_data.items():
         val = item['value']
         prev = item['prev']
@@ -153,14 +165,15 @@ def build_pmi_block_html(pmi_data: dict) -> str:
         else:
             diff_str = ""
 
-        items_html += f"""
+        parts.append(f"""
         <div class="pmi-item">
             <div class="pmi-name">{name}</div>
             <div class="pmi-value" style="color:{status_color};">{val:.1f}</div>
             <div class="pmi-meta">{diff_str} &nbsp;<span class="pmi-status" style="background:{status_color};">{status_text}</span></div>
             <div class="pmi-date">{date_str}</div>
-        </div>"""
+        </div>""")
 
+    items_html = "".join(parts)
     return f"""
     <div class="pmi-block">
         <div class="pmi-block-title">采购经理人指数（PMI）</div>
@@ -201,31 +214,67 @@ FOREX_TICKERS = {
 # ============================================================
 # Market Data Fetching
 # ============================================================
+def _fetch_ticker_closes(ticker: str):
+    """Fallback for a single symbol missing from the batched download."""
+    import yfinance as yf
+    return yf.Ticker(ticker).history(period="2d")['Close'].dropna()
+
+
 def fetch_market_data() -> dict:
+    import yfinance as yf
     print("Fetching market data from Yahoo Finance...")
     data = {"indices": {}, "commodities": {}, "forex": {}}
 
-    def get_ticker_data(ticker_dict, category):
+    categories = (("indices", INDEX_TICKERS), ("commodities", COMMODITY_TICKERS), ("forex", FOREX_TICKERS))
+    all_tickers = [t for _, ticker_dict in categories for t in ticker_dict.values()]
+
+    # One batched download for every symbol instead of one request per ticker.
+    # No session is passed in: yfinance keeps a single process-wide session (with
+    # its cookie/crumb) that download() and the Ticker retries below already share,
+    # and current releases reject plain requests.Session objects.
+    try:
+        batch = yf.download(all_tickers, period="2d", group_by="ticker",
+                            threads=True, progress=False)
+    except Exception as e:
+        print(f"  [WARN] Batch download failed: {e}")
+        batch = None
+
+    # Tickers trade on different calendars; drop rows from other markets
+    batch_closes = {}
+    if batch is not None and not batch.empty:
+        for ticker in all_tickers:
+            try:
+                batch_closes[ticker] = batch[ticker]['Close'].dropna()
+            except KeyError:
+                pass
+
+    # Symbols the batch came back without are retried individually, concurrently
+    missing = [t for t in all_tickers if len(batch_closes.get(t, ())) == 0]
+    retries = {}
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(16, len(missing))) as pool:
+            retries = {t: pool.submit(_fetch_ticker_closes, t) for t in missing}
+
+    for category, ticker_dict in categories:
         for name, ticker in ticker_dict.items():
             try:
-                t = yf.Ticker(ticker)
-                hist = t.history(period="2d")
-                if len(hist) >= 2:
-                    prev_close = hist['Close'].iloc[-2]
-                    last_price = hist['Close'].iloc[-1]
-                elif len(hist) == 1:
-                    last_price = hist['Close'].iloc[-1]
+                closes = retries[ticker].result() if ticker in retries else batch_closes[ticker]
+                if len(closes) >= 2:
+                    prev_close = closes.iloc[-2]
+                    last_price = closes.iloc[-1]
+                elif len(closes) == 1:
+                    last_price = closes.iloc[-1]
                     prev_close = last_price
                 else:
                     raise ValueError("No data")
                 change = last_price - prev_close
                 pct = (change / prev_close) * 100 if prev_close else 0
-                is_up = pct >= 0
+                # is_up: 1 = up/flat, 0 = down, -1 = no data (see the N/A branch below)
                 data[category][name] = {
                     "price": f"{last_price:.2f}",
                     "change": f"{change:+.2f}",
                     "pct": f"{pct:+.2f}%",
-                    "is_up": int(is_up) if is_up is not None else None,
+                    "is_up": 1 if pct >= 0 else 0,
                     "display": f"{last_price:.2f} ({pct:+.2f}%)"
                 }
             except Exception as e:
@@ -235,9 +284,6 @@ def fetch_market_data() -> dict:
                     "is_up": -1, "display": "N/A"
                 }
 
-    get_ticker_data(INDEX_TICKERS, "indices")
-    get_ticker_data(COMMODITY_TICKERS, "commodities")
-    get_ticker_data(FOREX_TICKERS, "forex")
     print("Market data fetching complete.")
     return data
 
@@ -245,13 +291,14 @@ def fetch_market_data() -> dict:
 # ============================================================
 # AI Content Generation
 # ============================================================
-def generate_report_content(market_data: dict, news_text: str) -> str:
+def generate_report_content(market_data: dict, news_text: str, date_cn: str = None) -> str:
+    import openai
     print("Generating AI analysis with multi-source news data...")
 
-    indices_str = "  ".join([f"{k}: {v['display']}" for k, v in market_data['indices'].items()])
-    commodities_str = "  ".join([f"{k}: {v['display']}" for k, v in market_data['commodities'].items()])
-    forex_str = "  ".join([f"{k}: {v['display']}" for k, v in market_data['forex'].items()])
-    today = datetime.now().strftime('%Y年%m月%d日')
+    indices_str = "  ".join(f"{k}: {v['display']}" for k, v in market_data['indices'].items())
+    commodities_str = "  ".join(f"{k}: {v['display']}" for k, v in market_data['commodities'].items())
+    forex_str = "  ".join(f"{k}: {v['display']}" for k, v in market_data['forex'].items())
+    today = date_cn or datetime.now().strftime('%Y年%m月%d日')
 
     prompt = f"""你是一位顶级专业金融分析师，服务于中国高净值投资者和机构客户。今天是{today}。
 
@@ -464,7 +511,7 @@ def generate_report_content(market_data: dict, news_text: str) -> str:
     model_name = os.environ.get("OPENAI_MODEL", "Qwen/Qwen2.5-72B-Instruct")
     client = openai.OpenAI(base_url=base_url)
     try:
-        response = client.chat.completions.create(
+        stream = client.chat.completions.create(
             model=model_name,
             messages=[
                 {"role": "system", "content": "你是一位服务于中国高净值投资者的顶级金融分析师，擅长整合全球多渠道信息，提供深度、准确、有洞察力的市场分析报告。你的报告风格专业、简洁、数据驱动，深受机构投资者信赖。"},
@@ -472,8 +519,27 @@ def generate_report_content(market_data: dict, news_text: str) -> str:
             ],
             max_tokens=5000,
             temperature=0.7,
+            stream=True,
         )
-        content = response.choices[0].message.content
+        # Consume tokens as they arrive instead of blocking on the full completion
+        parts = []
+        pending = ""  # partial last line carried over between chunks
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                delta = chunk.choices[0].delta.content
+                parts.append(delta)
+                if "\n" not in delta:
+                    pending += delta
+                    continue
+                # Report each section heading as soon as its line is complete
+                *lines, pending = (pending + delta).split("\n")
+                for line in lines:
+                    if line.startswith("## "):
+                        print(f"  [AI] {line[3:].strip()}")
+        # A completion ending without a newline leaves its last line in pending
+        if pending.startswith("## "):
+            print(f"  [AI] {pending[3:].strip()}")
+        content = "".join(parts)
         print("AI analysis generation complete.")
         return content
     except Exception as e:
@@ -484,14 +550,87 @@ def generate_report_content(market_data: dict, news_text: str) -> str:
 # ============================================================
 # Markdown to HTML (precise reference-matching renderer)
 # ============================================================
+# AI text is plain markdown, so "&", "<" and ">" are literal characters, not markup
+_HTML_ESC = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+_BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+_ITAL_RE = re.compile(r'\*(.+?)\*')
+# Bold and italic in one alternation so each line is scanned once; bold wins at a "**",
+# and an italic span may contain whole **bold** runs (nesting is rendered by the callback)
+_INLINE_RE = re.compile(r'\*\*(.+?)\*\*|\*((?:\*\*.+?\*\*|[^*])+)\*')
+# One multiline scan yields exactly one match per line (the same lines as split('\n'));
+# the matched group name selects the branch. [^\S\n] keeps whitespace from crossing lines.
+_BLOCK_RE = re.compile(
+    r'^(?:(?P<h2>## )|(?P<h3>### )|(?P<dash>- )'
+    r'|[^\S\n]*(?:(?P<hr>---[^\S\n]*$)|(?P<dot>·)|(?P<bullet>• (?=.*\S))))?.*$',
+    re.M,
+)
+
+
+_BULLET_KINDS = frozenset(('dot', 'bullet', 'dash'))
+
+
+def _is_bullet_line(m: re.Match) -> bool:
+    return m.lastgroup in _BULLET_KINDS
+
+
+@functools.lru_cache(maxsize=2048)
 def process_inline(text: str) -> str:
     """Process inline markdown: **bold**, *italic*"""
-    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
-    text = re.sub(r'\*(.+?)\*', r'<em>\1</em>', text)
-    return text
+    return _INLINE_RE.sub(_inline_repl, text.translate(_HTML_ESC))
+
+
+def _inline_repl(m: re.Match) -> str:
+    bold, ital = m.groups()
+    if bold is None:
+        # Bold nested inside italic, e.g. *note: **final** data*
+        ital = _BOLD_RE.sub(r'<strong>\1</strong>', ital)
+        return f'<em>{ital}</em>'
+    # Italic nested inside bold, e.g. **up *3%* today**
+    bold = _ITAL_RE.sub(r'<em>\1</em>', bold)
+    return f'<strong>{bold}</strong>'
+
+
+MD_CACHE_DIR = Path(".md_cache")
+# Bump whenever the rendered output changes so stale disk entries are not reused
+MD_CACHE_VERSION = "3"
+MD_CACHE_MAX_AGE = 7 * 86400  # seconds; a daily report's markdown is never rendered again after this
+
+
+def _prune_md_cache():
+    """Delete disk-cache entries from other MD_CACHE_VERSIONs or older than MD_CACHE_MAX_AGE."""
+    current = f"v{MD_CACHE_VERSION}_"
+    expiry = time.time() - MD_CACHE_MAX_AGE
+    for entry in MD_CACHE_DIR.glob("*.html"):
+        try:
+            if not entry.name.startswith(current) or entry.stat().st_mtime < expiry:
+                entry.unlink()
+        except OSError:
+            pass  # already removed by a concurrent run
 
 
+@functools.lru_cache(maxsize=32)
 def markdown_to_html(md_text: str) -> str:
+    """Render markdown via _render_markdown, memoized in-process and on disk by content hash."""
+    key = hashlib.blake2b(f"{MD_CACHE_VERSION}\0{md_text}".encode("utf-8"), digest_size=16).hexdigest()
+    path = MD_CACHE_DIR / f"v{MD_CACHE_VERSION}_{key}.html"
+    try:
+        return path.read_text(encoding="utf-8")
+    except OSError:
+        pass
+
+    html = _render_markdown(md_text)
+    try:
+        MD_CACHE_DIR.mkdir(exist_ok=True)
+        tmp_path = path.with_name(f"{key}.{os.getpid()}.tmp")
+        tmp_path.write_text(html, encoding="utf-8")
+        os.replace(tmp_path, path)  # atomic: readers never see a partial file
+        _prune_md_cache()  # only on a miss, so cache hits stay a single read
+    except OSError as e:
+        print(f"  [WARN] markdown cache not saved: {e}")
+    return html
+
+
+def _render_markdown(md_text: str) -> str:
     """
     Convert markdown to HTML matching the reference document style exactly.
     Key rules:
@@ -501,69 +640,45 @@ def markdown_to_html(md_text: str) -> str:
     - --- -> section divider
     - Regular paragraphs -> <p>
     """
-    lines = md_text.split('\n')
     html_lines = []
-    in_bullet = False
-
-    for line in lines:
-        stripped = line.strip()
-
-        # H2: ## 一、市场概览
-        if re.match(r'^## ', line):
-            if in_bullet:
-                html_lines.append('</ul>')
-                in_bullet = False
-            title = line[3:].strip()
-            html_lines.append(f'<h2 class="section-title">{process_inline(title)}</h2>')
-
-        # H3: ### 2.1 ...
-        elif re.match(r'^### ', line):
-            if in_bullet:
-                html_lines.append('</ul>')
-                in_bullet = False
-            title = line[4:].strip()
-            html_lines.append(f'<h3 class="subsection-title">{process_inline(title)}</h3>')
-
-        # Horizontal rule
-        elif stripped == '---':
-            if in_bullet:
-                html_lines.append('</ul>')
-                in_bullet = False
-            html_lines.append('<hr class="section-divider">')
-
-        # Bullet items starting with · (used in key figures section)
-        elif stripped.startswith('·') or stripped.startswith('• ') or re.match(r'^- ', line):
-            if not in_bullet:
-                html_lines.append('<ul class="bullet-list">')
-                in_bullet = True
-            if stripped.startswith('·'):
-                # Multiple bullets on one line separated by ·
-                parts = [p.strip() for p in stripped.split('·') if p.strip()]
-                for part in parts:
-                    html_lines.append(f'<li>{process_inline(part)}</li>')
-            elif stripped.startswith('• '):
-                content = stripped[2:].strip()
-                html_lines.append(f'<li>{process_inline(content)}</li>')
-            else:
-                content = line[2:].strip()
-                html_lines.append(f'<li>{process_inline(content)}</li>')
-
-        # Empty line
-        elif stripped == '':
-            if in_bullet:
-                html_lines.append('</ul>')
-                in_bullet = False
-            html_lines.append('')
-
-        # Regular paragraph
-        else:
-            if in_bullet:
-                html_lines.append('</ul>')
-                in_bullet = False
-            html_lines.append(f'<p>{process_inline(stripped)}</p>')
+    append = html_lines.append
+
+    # Runs of consecutive bullet lines become one <ul>; everything else is per line
+    for is_bullet, run in itertools.groupby(_BLOCK_RE.finditer(md_text), key=_is_bullet_line):
+        if is_bullet:
+            append('<ul class="bullet-list">')
+            for m in run:
+                kind = m.lastgroup
+                # Bullet items: "· a · b" (key figures section), "• a" and "- a"
+                if kind == 'dot':
+                    # Multiple bullets on one line separated by ·
+                    for part in m.group().strip().split('·'):
+                        part = part.strip()
+                        if part:
+                            append(f'<li>{process_inline(part)}</li>')
+                elif kind == 'bullet':
+                    append(f'<li>{process_inline(m.group().strip()[2:].strip())}</li>')
+                else:
+                    append(f'<li>{process_inline(m.group()[2:].strip())}</li>')
+            append('</ul>')
+            continue
 
-    if in_bullet:
-        html_lines.append('</ul>')
+        for m in run:
+            line = m.group()
+            kind = m.lastgroup
+            # H2: ## 一、市场概览
+            if kind == 'h2':
+                append(f'<h2 class="section-title">{process_inline(line[3:].strip())}</h2>')
+            # H3: ### 2.1 ...
+            elif kind == 'h3':
+                append(f'<h3 class="subsection-title">{process_inline(line[4:].strip())}</h3>')
+            # Horizontal rule
+            elif kind == 'hr':
+                append('<hr class="section-divider">')
+            else:
+                stripped = line.strip()
+                # Empty line / regular paragraph
+                append(f'<p>{process_inline(stripped)}</p>' if stripped else '')
 
     return '\n'.join(html_lines)
 
@@ -571,41 +686,39 @@ def markdown_to_html(md_text: str) -> str:
 # ============================================================
 # Market Data Table HTML (color-coded)
 # ============================================================
-def build_market_table(market_data: dict) -> str:
-    """Build a clean color-coded market data table."""
-
-    def row(name, info):
-        pct_str = info.get('pct', 'N/A')
-        price_str = info.get('price', 'N/A')
-        change_str = info.get('change', 'N/A')
-        is_up = info.get('is_up', None)
-        if is_up == 1:
-            color_class = 'up'
-            arrow = '▲'
-        elif is_up == 0:
-            color_class = 'down'
-            arrow = '▼'
-        else:
-            color_class = 'neutral'
-            arrow = '—'
-        return f'''<tr>
-            <td class="col-name">{name}</td>
-            <td class="col-price">{price_str}</td>
-            <td class="col-change {color_class}">{arrow} {change_str}</td>
-            <td class="col-pct {color_class}">{pct_str}</td>
+# One pre-baked <tr> template per is_up value (1 up, 0 down, -1 no data); only the
+# per-row values are substituted at render time
+_ROW_TEMPLATE = '''<tr>
+            <td class="col-name">{{name}}</td>
+            <td class="col-price">{{price}}</td>
+            <td class="col-change {color_class}">{arrow} {{change}}</td>
+            <td class="col-pct {color_class}">{{pct}}</td>
         </tr>'''
+_ROW_TEMPLATES = {
+    is_up: _ROW_TEMPLATE.format(color_class=color_class, arrow=arrow)
+    for is_up, color_class, arrow in ((1, 'up', '▲'), (0, 'down', '▼'), (-1, 'neutral', '—'))
+}
 
-    indices_rows = ''.join([row(k, v) for k, v in market_data['indices'].items()])
-    commodity_rows = ''.join([row(k, v) for k, v in market_data['commodities'].items()])
-    forex_rows = ''.join([row(k, v) for k, v in market_data['forex'].items()])
 
-    return f'''
+def _emit_rows(items: dict, append) -> None:
+    """Append one category's <tr> rows via ``append`` (the caller's bound list.append)."""
+    for name, info in items.items():
+        append(_ROW_TEMPLATES[info['is_up']].format_map(info | {'name': name}))
+
+
+def build_market_table(market_data: dict) -> str:
+    """Build a clean color-coded market data table."""
+    parts = []
+    append = parts.append
+    append('''
 <div class="market-tables">
   <div class="market-table-group">
     <div class="table-label">主要股票指数</div>
     <table class="market-table">
       <thead><tr><th>指数</th><th>最新价</th><th>涨跌额</th><th>涨跌幅</th></tr></thead>
-      <tbody>{indices_rows}</tbody>
+      <tbody>''')
+    _emit_rows(market_data['indices'], append)
+    append('''</tbody>
     </table>
   </div>
   <div class="market-table-row">
@@ -613,53 +726,32 @@ def build_market_table(market_data: dict) -> str:
       <div class="table-label">大宗商品</div>
       <table class="market-table">
         <thead><tr><th>品种</th><th>最新价</th><th>涨跌额</th><th>涨跌幅</th></tr></thead>
-        <tbody>{commodity_rows}</tbody>
+        <tbody>''')
+    _emit_rows(market_data['commodities'], append)
+    append('''</tbody>
       </table>
     </div>
     <div class="market-table-group half">
       <div class="table-label">外汇市场</div>
       <table class="market-table">
         <thead><tr><th>品种</th><th>最新价</th><th>涨跌额</th><th>涨跌幅</th></tr></thead>
-        <tbody>{forex_rows}</tbody>
+        <tbody>''')
+    _emit_rows(market_data['forex'], append)
+    append('''</tbody>
       </table>
     </div>
   </div>
-</div>'''
+</div>''')
+    return ''.join(parts)
 
 
 # ============================================================
 # HTML Report Generation
 # ============================================================
-def generate_html_report(market_data: dict, generated_content: str, report_date: str, pmi_data: dict = None) -> str:
-    if pmi_data is None:
-        pmi_data = {}
-    content_html = markdown_to_html(generated_content)
-    market_table_html = build_market_table(market_data)
-
-    # Inline data for appendix (matching reference style)
-    indices_inline = " &nbsp;-&nbsp; ".join([
-        f"<strong>{k}</strong>：{v['display']}" for k, v in market_data['indices'].items()
-    ])
-    commodities_inline = " &nbsp;-&nbsp; ".join([
-        f"<strong>{k}</strong>：{v['display']}" for k, v in market_data['commodities'].items()
-    ])
-    forex_inline = " &nbsp;-&nbsp; ".join([
-        f"<strong>{k}</strong>：{v['display']}" for k, v in market_data['forex'].items()
-    ])
-
-    generation_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    pmi_block_html = build_pmi_block_html(pmi_data)
-
-    html = f"""<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>链采联盟-每日财经信息 - {report_date}</title>
-    <style>
-        /* ===== Reset & Base ===== */
-        * {{ box-sizing: border-box; margin: 0; padding: 0; }}
-        body {{
+# Static stylesheet for the v1 report, evaluated once at import
+_REPORT_CSS = """        /* ===== Reset & Base ===== */
+        * { box-sizing: border-box; margin: 0; padding: 0; }
+        body {
             font-family: 'PingFang SC', 'Microsoft YaHei', 'SimHei',
                          'Noto Sans CJK SC', 'WenQuanYi Zen Hei',
                          'Droid Sans Fallback', sans-serif;
@@ -667,22 +759,22 @@ def generate_html_report(market_data: dict, generated_content: str, report_date:
             color: #222222;
             font-size: 14.5px;
             line-height: 1.85;
-        }}
-        .page {{
+        }
+        .page {
             max-width: 900px;
             margin: 0 auto;
             padding: 52px 68px 64px;
-        }}
+        }
 
         /* ===== PMI Block ===== */
-        .pmi-block {{
+        .pmi-block {
             margin: 18px 0 28px;
             padding: 16px 20px;
             background: #f8faff;
             border: 1px solid #dbeafe;
             border-radius: 6px;
-        }}
-        .pmi-block-title {{
+        }
+        .pmi-block-title {
             font-size: 13px;
             font-weight: 700;
             color: #1d4ed8;
@@ -691,69 +783,69 @@ def generate_html_report(market_data: dict, generated_content: str, report_date:
             margin-bottom: 12px;
             border-bottom: 1px solid #dbeafe;
             padding-bottom: 8px;
-        }}
-        .pmi-grid {{
+        }
+        .pmi-grid {
             display: flex;
             flex-wrap: wrap;
             gap: 12px;
-        }}
-        .pmi-item {{
+        }
+        .pmi-item {
             flex: 1;
             min-width: 160px;
             background: #ffffff;
             border: 1px solid #e2e8f0;
             border-radius: 5px;
             padding: 10px 14px;
-        }}
-        .pmi-name {{
+        }
+        .pmi-name {
             font-size: 12px;
             color: #555;
             margin-bottom: 4px;
-        }}
-        .pmi-value {{
+        }
+        .pmi-value {
             font-size: 26px;
             font-weight: 800;
             line-height: 1.2;
-        }}
-        .pmi-meta {{
+        }
+        .pmi-meta {
             font-size: 12px;
             margin-top: 4px;
             display: flex;
             align-items: center;
             gap: 6px;
-        }}
-        .pmi-status {{
+        }
+        .pmi-status {
             color: #fff;
             font-size: 11px;
             padding: 1px 6px;
             border-radius: 3px;
             font-weight: 600;
-        }}
-        .pmi-date {{
+        }
+        .pmi-date {
             font-size: 11px;
             color: #999;
             margin-top: 4px;
-        }}
+        }
 
         /* ===== Report Header ===== */
-        .report-header {{
+        .report-header {
             margin-bottom: 32px;
-        }}
-        .report-title {{
+        }
+        .report-title {
             font-size: 26px;
             font-weight: 800;
             color: #0f2a4a;
             letter-spacing: 0.5px;
             margin-bottom: 10px;
-        }}
-        .title-rule {{
+        }
+        .title-rule {
             border: none;
             border-top: 2.5px solid #1d4ed8;
             margin: 0;
-        }}
+        }
 
         /* ===== Section Headings ===== */
-        h2.section-title {{
+        h2.section-title {
             font-size: 20px;
             font-weight: 800;
             color: #0f2a4a;
@@ -761,41 +853,41 @@ def generate_html_report(market_data: dict, generated_content: str, report_date:
             padding-left: 14px;
             margin: 44px 0 16px;
             line-height: 1.4;
-        }}
-        h3.subsection-title {{
+        }
+        h3.subsection-title {
             font-size: 15px;
             font-weight: 700;
             color: #0f2a4a;
             margin: 26px 0 10px;
             padding: 0;
-        }}
+        }
 
         /* ===== Body Text ===== */
-        p {{
+        p {
             margin: 8px 0;
             color: #2d2d2d;
             text-align: justify;
             font-size: 14.5px;
-        }}
-        strong {{
+        }
+        strong {
             color: #0f2a4a;
             font-weight: 700;
-        }}
+        }
 
         /* ===== Bullet List ===== */
-        ul.bullet-list {{
+        ul.bullet-list {
             list-style: none;
             padding: 0;
             margin: 6px 0;
-        }}
-        ul.bullet-list li {{
+        }
+        ul.bullet-list li {
             padding: 3px 0 3px 18px;
             position: relative;
             font-size: 14px;
             color: #2d2d2d;
             line-height: 1.75;
-        }}
-        ul.bullet-list li::before {{
+        }
+        ul.bullet-list li::before {
             content: "·";
             position: absolute;
             left: 4px;
@@ -803,31 +895,31 @@ def generate_html_report(market_data: dict, generated_content: str, report_date:
             font-weight: 900;
             font-size: 18px;
             line-height: 1.4;
-        }}
+        }
 
         /* ===== Section Divider ===== */
-        hr.section-divider {{
+        hr.section-divider {
             border: none;
             border-top: 1px solid #d1d5db;
             margin: 36px 0;
-        }}
+        }
 
         /* ===== Market Data Tables ===== */
-        .market-tables {{
+        .market-tables {
             margin: 20px 0 8px;
-        }}
-        .market-table-group {{
+        }
+        .market-table-group {
             margin-bottom: 18px;
-        }}
-        .market-table-group.half {{
+        }
+        .market-table-group.half {
             width: 48%;
-        }}
-        .market-table-row {{
+        }
+        .market-table-row {
             display: flex;
             gap: 4%;
             align-items: flex-start;
-        }}
-        .table-label {{
+        }
+        .table-label {
             font-size: 13px;
             font-weight: 700;
             color: #4b5563;
@@ -836,132 +928,182 @@ def generate_html_report(market_data: dict, generated_content: str, report_date:
             margin-bottom: 6px;
             border-bottom: 1px solid #e5e7eb;
             padding-bottom: 4px;
-        }}
-        table.market-table {{
+        }
+        table.market-table {
             width: 100%;
             border-collapse: collapse;
             font-size: 13.5px;
-        }}
-        table.market-table thead tr {{
+        }
+        table.market-table thead tr {
             background: #f0f4f8;
-        }}
-        table.market-table th {{
+        }
+        table.market-table th {
             padding: 7px 10px;
             text-align: left;
             font-weight: 700;
             color: #374151;
             font-size: 12.5px;
             border-bottom: 1.5px solid #d1d5db;
-        }}
-        table.market-table td {{
+        }
+        table.market-table td {
             padding: 6px 10px;
             border-bottom: 1px solid #f0f0f0;
             color: #222222;
-        }}
-        table.market-table tr:hover td {{
+        }
+        table.market-table tr:hover td {
             background: #f9fafb;
-        }}
-        td.col-name {{
+        }
+        td.col-name {
             font-weight: 600;
             color: #1a1a2e;
-        }}
-        td.col-price {{
+        }
+        td.col-price {
             font-variant-numeric: tabular-nums;
-        }}
-        td.up {{ color: #dc2626; font-weight: 600; }}
-        td.down {{ color: #16a34a; font-weight: 600; }}
-        td.neutral {{ color: #6b7280; }}
+        }
+        td.up { color: #dc2626; font-weight: 600; }
+        td.down { color: #16a34a; font-weight: 600; }
+        td.neutral { color: #6b7280; }
 
         /* ===== Data Appendix (inline text style) ===== */
-        .data-appendix {{
+        .data-appendix {
             margin-top: 8px;
-        }}
-        .data-row {{
+        }
+        .data-row {
             margin: 10px 0;
             font-size: 14px;
             color: #2d2d2d;
             line-height: 1.9;
-        }}
+        }
 
         /* ===== Footer ===== */
-        .report-footer {{
+        .report-footer {
             margin-top: 40px;
             padding-top: 18px;
             border-top: 1px solid #d1d5db;
-        }}
-        .report-footer p {{
+        }
+        .report-footer p {
             margin: 5px 0;
             font-size: 12.5px;
             color: #6b7280;
-        }}
-        .report-footer strong {{
+        }
+        .report-footer strong {
             color: #374151;
             font-weight: 600;
-        }}
+        }
 
         /* ===== Print / PDF ===== */
-        @media print {{
-            body {{ font-size: 13px; line-height: 1.75; }}
-            .page {{ padding: 24px 36px; max-width: 100%; }}
-            h2.section-title {{ font-size: 17px; margin: 32px 0 12px; }}
-            h3.subsection-title {{ font-size: 14px; }}
-            table.market-table {{ font-size: 12px; }}
-        }}
-    </style>
+        @media print {
+            body { font-size: 13px; line-height: 1.75; }
+            .page { padding: 24px 36px; max-width: 100%; }
+            h2.section-title { font-size: 17px; margin: 32px 0 12px; }
+            h3.subsection-title { font-size: 14px; }
+            table.market-table { font-size: 12px; }
+        }
+"""
+
+
+# Page scaffold for the v1 report, parsed once at import; the stylesheet is baked in
+_REPORT_TEMPLATE = string.Template("""<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>链采联盟-每日财经信息 - ${report_date}</title>
+    <style>
+""" + _REPORT_CSS + """    </style>
 </head>
 <body>
 <div class="page">
 
     <!-- ===== Header ===== -->
     <div class="report-header">
-        <h1 class="report-title">链采联盟-每日财经信息 &nbsp;·&nbsp; {report_date}</h1>
+        <h1 class="report-title">链采联盟-每日财经信息 &nbsp;·&nbsp; ${report_date}</h1>
         <hr class="title-rule">
     </div>
 
     <!-- ===== PMI Block ===== -->
-    {pmi_block_html}
+    ${pmi_block_html}
 
     <!-- ===== AI Generated Content ===== -->
-    {content_html}
+    ${content_html}
 
     <!-- ===== Market Data Tables (inserted before Data Appendix) ===== -->
     <hr class="section-divider">
     <h2 class="section-title">八、数据附录</h2>
-    {market_table_html}
+    ${market_table_html}
 
     <div class="data-appendix" style="margin-top:20px;">
         <div class="data-row">
-            <strong>主要指数</strong>（截至{report_date}）：{indices_inline}
+            <strong>主要指数</strong>（截至${report_date}）：${indices_inline}
         </div>
         <div class="data-row">
-            <strong>大宗商品</strong>：{commodities_inline}
+            <strong>大宗商品</strong>：${commodities_inline}
         </div>
         <div class="data-row">
-            <strong>外汇</strong>：{forex_inline}
+            <strong>外汇</strong>：${forex_inline}
         </div>
     </div>
 
     <!-- ===== Footer ===== -->
     <div class="report-footer">
         <hr class="section-divider" style="margin-bottom:14px;">
-        <p><strong>报告生成时间：</strong>{generation_time}</p>
+        <p><strong>报告生成时间：</strong>${generation_time}</p>
         <p><strong>数据来源：</strong>Bloomberg · Financial Times · WSJ · CNBC · MarketWatch · The Economist · Federal Reserve · ECB · BIS · OilPrice · TechCrunch · MIT Tech Review · SCMP · Nikkei Asia · CoinDesk · Seeking Alpha · Yahoo Finance · Business Insider · Supply Chain Dive · Procurement Magazine · Spend Matters · Logistics Management 等 28+ 权威来源</p>
         <p><strong>免责声明：</strong>本报告仅供参考，不构成投资建议。投资有风险，入市需谨慎。</p>
     </div>
 
 </div>
 </body>
-</html>"""
-    return html
+</html>""")
+
+
+_APPENDIX_SEP = " &nbsp;-&nbsp; "
+
+
+def _appendix_inline(items: dict) -> str:
+    """Render one data-appendix row as inline "name：value" entries."""
+    return _APPENDIX_SEP.join(f"<strong>{k}</strong>：{v['display']}" for k, v in items.items())
+
+
+def generate_html_report(market_data: dict, generated_content: str, report_date: str, pmi_data: dict = None,
+                         generation_time: str = None) -> str:
+    if pmi_data is None:
+        pmi_data = {}
+    content_html = markdown_to_html(generated_content)
+    market_table_html = build_market_table(market_data)
+
+    # Inline data for appendix (matching reference style)
+    indices_inline = _appendix_inline(market_data['indices'])
+    commodities_inline = _appendix_inline(market_data['commodities'])
+    forex_inline = _appendix_inline(market_data['forex'])
+
+    if generation_time is None:
+        generation_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    pmi_block_html = build_pmi_block_html(pmi_data)
+
+    return _REPORT_TEMPLATE.substitute(
+        report_date=report_date,
+        pmi_block_html=pmi_block_html,
+        content_html=content_html,
+        market_table_html=market_table_html,
+        indices_inline=indices_inline,
+        commodities_inline=commodities_inline,
+        forex_inline=forex_inline,
+        generation_time=generation_time,
+    )
 
 
 # ============================================================
 # PDF Generation (Chinese font support)
 # ============================================================
-def generate_pdf_from_html(html_content: str, pdf_path: str):
-    from weasyprint import HTML, CSS
-
-    font_css = CSS(string="""
+# Embedding whole fonts skips WeasyPrint's per-render glyph subsetting (much faster for
+# CJK) but adds megabytes per PDF, which matters for the email attachments; opt-in only.
+PDF_FULL_FONTS = os.environ.get("PDF_FULL_FONTS", "").lower() in ("1", "true", "yes")
+# GENERATE_PDF=0 skips both PDF renders (HTML, JSON and markdown are still written); handy for
+# fast local iteration or WeChat-only runs, since send_report attaches only PDFs that exist.
+GENERATE_PDF = os.environ.get("GENERATE_PDF", "1").lower() not in ("0", "false", "no")
+
+_PDF_FONT_CSS = """
         @font-face {
             font-family: 'CJKFont';
             src: local('Noto Sans CJK SC'), local('Noto Sans SC'),
@@ -976,9 +1118,26 @@ def generate_pdf_from_html(html_content: str, pdf_path: str):
             size: A4;
             margin: 18mm 20mm 18mm 20mm;
         }
-    """)
+    """
+
+
+@functools.lru_cache(maxsize=None)
+def _pdf_font_resources():
+    """Build the font configuration and parsed font stylesheet once; both PDFs render in one process and share it."""
+    from weasyprint import CSS
+    from weasyprint.text.fonts import FontConfiguration
+
+    font_config = FontConfiguration()
+    return font_config, CSS(string=_PDF_FONT_CSS, font_config=font_config)
 
-    HTML(string=html_content, base_url=".").write_pdf(pdf_path, stylesheets=[font_css])
+
+def generate_pdf_from_html(html_content: str, pdf_path: str):
+    from weasyprint import HTML
+
+    font_config, font_css = _pdf_font_resources()
+    HTML(string=html_content, base_url=".").write_pdf(pdf_path, stylesheets=[font_css],
+                                                      font_config=font_config,
+                                                      full_fonts=PDF_FULL_FONTS)
     print(f"PDF saved: {pdf_path}")
 
 
@@ -986,13 +1145,13 @@ def generate_pdf_from_html(html_content: str, pdf_path: str):
 # NEW: Visual Report HTML Generator (v2 - Branded Cover)
 # ============================================================
 
+@functools.lru_cache(maxsize=32)
 def _md_to_html_simple(md_text: str) -> str:
     """Lightweight markdown-to-HTML for the visual report body."""
-    lines = md_text.split('\n')
     html_parts = []
     in_ul = False
-    for line in lines:
-        s = line.strip()
+    for line in md_text.splitlines():
+        s = line.strip().translate(_HTML_ESC)
         if not s or s == '---':
             if in_ul:
                 html_parts.append('</ul>')
@@ -1002,25 +1161,25 @@ def _md_to_html_simple(md_text: str) -> str:
             if in_ul:
                 html_parts.append('</ul>')
                 in_ul = False
-            title = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', s[3:])
+            title = _BOLD_RE.sub(r'<strong>\1</strong>', s[3:])
             html_parts.append(f'<h3 class="vis-h2">{title}</h3>')
         elif s.startswith('### '):
             if in_ul:
                 html_parts.append('</ul>')
                 in_ul = False
-            title = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', s[4:])
+            title = _BOLD_RE.sub(r'<strong>\1</strong>', s[4:])
             html_parts.append(f'<h4 class="vis-h3">{title}</h4>')
         elif s.startswith('- ') or s.startswith('· '):
             if not in_ul:
                 html_parts.append('<ul class="vis-ul">')
                 in_ul = True
-            content = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', s[2:])
+            content = _BOLD_RE.sub(r'<strong>\1</strong>', s[2:])
             html_parts.append(f'<li>{content}</li>')
         else:
             if in_ul:
                 html_parts.append('</ul>')
                 in_ul = False
-            content = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', s)
+            content = _BOLD_RE.sub(r'<strong>\1</strong>', s)
             html_parts.append(f'<p class="vis-p">{content}</p>')
     if in_ul:
         html_parts.append('</ul>')
@@ -1091,163 +1250,141 @@ def _build_market_summary_table(market_data: dict) -> str:
     )
 
 
-def generate_visual_html_report(market_data: dict, generated_content: str, report_date: str, pmi_data: dict = None) -> str:
-    """Generate the new visually rich PDF-optimized report (v2 - branded cover)."""
-    print("Generating v2 visual HTML report...")
-    if pmi_data is None:
-        pmi_data = {}
-    generation_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    date_cn = datetime.now().strftime('%Y年%m月%d日')
-
-    # Extract AI content sections
-    sec1_html = _md_to_html_simple(_extract_section(generated_content, '市场概览'))
-    sec2_html = _md_to_html_simple(_extract_section(generated_content, '宏观经济'))
-    sec3_html = _md_to_html_simple(_extract_section(generated_content, '行业动态'))
-    sec4_html = _md_to_html_simple(_extract_section(generated_content, '采购趋势'))
-    sec5_html = _md_to_html_simple(_extract_section(generated_content, '投资策略'))
-
-    market_cards = _build_market_cards(market_data)
-    market_table = _build_market_summary_table(market_data)
-
-    # PMI summary line
-    pmi_line = ''
-    if pmi_data:
-        pmi_items = [
-            f"{v['name']}: <strong>{v['value']:.1f}</strong>"
-            for v in list(pmi_data.values())[:4]
-        ]
-        pmi_line = f'<div class="vis-pmi-bar">PMI 快览：{" &nbsp;|&nbsp; ".join(pmi_items)}</div>'
-
-    html = f"""<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-<meta charset="UTF-8"/>
-<style>
-@page {{ size: A4; margin: 0; }}
-* {{ box-sizing: border-box; margin: 0; padding: 0; }}
-body {{
+# Static stylesheet for the v2 report, evaluated once at import
+_VISUAL_CSS = """@page { size: A4; margin: 0; }
+* { box-sizing: border-box; margin: 0; padding: 0; }
+body {
   font-family: "Noto Sans SC", "PingFang SC", "Microsoft YaHei", "SimHei", Arial, sans-serif;
   background: #fff; color: #1a1a1a; font-size: 12.5px; line-height: 1.75;
-}}
+}
 /* ═══ COVER ═══ */
-.cover {{
+.cover {
   width: 210mm; height: 297mm; position: relative; overflow: hidden;
   page-break-after: always; background: #0a0a0a;
-}}
-.cover-bg {{
+}
+.cover-bg {
   position: absolute; inset: 0;
   background:
     radial-gradient(ellipse 80% 60% at 70% 30%, rgba(160,20,20,0.55) 0%, transparent 70%),
     radial-gradient(ellipse 50% 40% at 20% 80%, rgba(100,10,10,0.4) 0%, transparent 60%),
     linear-gradient(160deg, #0f0000 0%, #1a0000 40%, #0a0a0a 100%);
-}}
-.cover-texture {{
+}
+.cover-texture {
   position: absolute; inset: 0;
   background: repeating-linear-gradient(-55deg, transparent 0px, transparent 28px,
     rgba(255,255,255,0.018) 28px, rgba(255,255,255,0.018) 29px);
-}}
-.cover-stripe {{
+}
+.cover-stripe {
   position: absolute; left: 0; top: 0; bottom: 0; width: 8px;
   background: linear-gradient(to bottom, #c0392b, #8b0000, #c0392b);
-}}
-.cover-topbar {{
+}
+.cover-topbar {
   position: absolute; top: 0; left: 8px; right: 0; height: 56px;
   background: rgba(0,0,0,0.6); border-bottom: 1px solid rgba(192,57,43,0.4);
   display: flex; align-items: center; padding: 0 36px; gap: 16px;
-}}
-.topbar-logo {{ font-size: 15px; font-weight: 900; color: #d4a017; letter-spacing: 2px; }}
-.topbar-sep {{ width: 1px; height: 20px; background: rgba(255,255,255,0.2); }}
-.topbar-sub {{ font-size: 11px; color: rgba(255,255,255,0.45); letter-spacing: 1px; }}
-.topbar-live {{ margin-left: auto; display: flex; align-items: center; gap: 7px; }}
-.live-dot {{ width: 8px; height: 8px; background: #c0392b; border-radius: 50%; box-shadow: 0 0 6px #c0392b; }}
-.live-text {{ font-size: 11px; font-weight: 700; color: #c0392b; letter-spacing: 2px; }}
-.cover-main {{
+}
+.topbar-logo { font-size: 15px; font-weight: 900; color: #d4a017; letter-spacing: 2px; }
+.topbar-sep { width: 1px; height: 20px; background: rgba(255,255,255,0.2); }
+.topbar-sub { font-size: 11px; color: rgba(255,255,255,0.45); letter-spacing: 1px; }
+.topbar-live { margin-left: auto; display: flex; align-items: center; gap: 7px; }
+.live-dot { width: 8px; height: 8px; background: #c0392b; border-radius: 50%; box-shadow: 0 0 6px #c0392b; }
+.live-text { font-size: 11px; font-weight: 700; color: #c0392b; letter-spacing: 2px; }
+.cover-main {
   position: absolute; top: 56px; left: 8px; right: 0; bottom: 80px;
   padding: 44px 44px 32px; display: flex; flex-direction: column; justify-content: space-between;
-}}
-.push-label {{ display: flex; align-items: center; gap: 10px; margin-bottom: 24px; }}
-.push-tag {{ background: #c0392b; color: #fff; font-size: 11px; font-weight: 900; letter-spacing: 3px; padding: 5px 14px; border-radius: 2px; }}
-.push-chain {{ font-size: 13px; font-weight: 700; color: #d4a017; letter-spacing: 1.5px; }}
-.cover-headline {{ margin-bottom: 28px; }}
-.eyebrow {{ font-size: 12px; color: rgba(255,255,255,0.35); letter-spacing: 3px; text-transform: uppercase; margin-bottom: 10px; }}
-.cover-headline h1 {{ font-size: 46px; font-weight: 900; color: #fff; line-height: 1.1; margin-bottom: 8px; }}
-.cover-headline h2 {{ font-size: 22px; font-weight: 700; color: #d4a017; line-height: 1.2; margin-bottom: 16px; }}
-.cover-desc {{ font-size: 12px; color: rgba(255,255,255,0.45); line-height: 1.8; max-width: 420px; border-left: 2px solid rgba(192,57,43,0.5); padding-left: 14px; }}
-.cover-stats {{ display: flex; gap: 12px; margin-bottom: 28px; }}
-.cstat {{ flex: 1; background: rgba(255,255,255,0.06); border: 1px solid rgba(255,255,255,0.1); border-top: 2px solid #c0392b; border-radius: 4px; padding: 12px 10px; text-align: center; }}
-.cstat .v {{ display: block; font-size: 20px; font-weight: 900; line-height: 1; margin-bottom: 3px; }}
-.cstat .v2 {{ display: block; font-size: 12px; font-weight: 700; margin-bottom: 3px; }}
-.cstat .l {{ font-size: 10px; color: rgba(255,255,255,0.4); }}
-.cover-toc {{ display: flex; border: 1px solid rgba(255,255,255,0.1); border-radius: 4px; overflow: hidden; }}
-.toc-item {{ flex: 1; padding: 10px 8px; text-align: center; border-right: 1px solid rgba(255,255,255,0.08); background: rgba(255,255,255,0.03); }}
-.toc-item:last-child {{ border-right: none; }}
-.toc-num {{ display: block; font-size: 16px; font-weight: 900; color: rgba(192,57,43,0.7); line-height: 1; margin-bottom: 3px; }}
-.toc-name {{ font-size: 10px; color: rgba(255,255,255,0.4); line-height: 1.4; }}
-.cover-footer {{
+}
+.push-label { display: flex; align-items: center; gap: 10px; margin-bottom: 24px; }
+.push-tag { background: #c0392b; color: #fff; font-size: 11px; font-weight: 900; letter-spacing: 3px; padding: 5px 14px; border-radius: 2px; }
+.push-chain { font-size: 13px; font-weight: 700; color: #d4a017; letter-spacing: 1.5px; }
+.cover-headline { margin-bottom: 28px; }
+.eyebrow { font-size: 12px; color: rgba(255,255,255,0.35); letter-spacing: 3px; text-transform: uppercase; margin-bottom: 10px; }
+.cover-headline h1 { font-size: 46px; font-weight: 900; color: #fff; line-height: 1.1; margin-bottom: 8px; }
+.cover-headline h2 { font-size: 22px; font-weight: 700; color: #d4a017; line-height: 1.2; margin-bottom: 16px; }
+.cover-desc { font-size: 12px; color: rgba(255,255,255,0.45); line-height: 1.8; max-width: 420px; border-left: 2px solid rgba(192,57,43,0.5); padding-left: 14px; }
+.cover-stats { display: flex; gap: 12px; margin-bottom: 28px; }
+.cstat { flex: 1; background: rgba(255,255,255,0.06); border: 1px solid rgba(255,255,255,0.1); border-top: 2px solid #c0392b; border-radius: 4px; padding: 12px 10px; text-align: center; }
+.cstat .v { display: block; font-size: 20px; font-weight: 900; line-height: 1; margin-bottom: 3px; }
+.cstat .v2 { display: block; font-size: 12px; font-weight: 700; margin-bottom: 3px; }
+.cstat .l { font-size: 10px; color: rgba(255,255,255,0.4); }
+.cover-toc { display: flex; border: 1px solid rgba(255,255,255,0.1); border-radius: 4px; overflow: hidden; }
+.toc-item { flex: 1; padding: 10px 8px; text-align: center; border-right: 1px solid rgba(255,255,255,0.08); background: rgba(255,255,255,0.03); }
+.toc-item:last-child { border-right: none; }
+.toc-num { display: block; font-size: 16px; font-weight: 900; color: rgba(192,57,43,0.7); line-height: 1; margin-bottom: 3px; }
+.toc-name { font-size: 10px; color: rgba(255,255,255,0.4); line-height: 1.4; }
+.cover-footer {
   position: absolute; bottom: 0; left: 8px; right: 0; height: 80px;
   background: rgba(0,0,0,0.7); border-top: 1px solid rgba(192,57,43,0.3);
   display: flex; align-items: center; padding: 0 44px; justify-content: space-between;
-}}
-.cf-brand {{ font-size: 14px; font-weight: 700; color: #d4a017; letter-spacing: 1px; }}
-.cf-sub {{ font-size: 10px; color: rgba(255,255,255,0.3); margin-top: 2px; }}
-.cf-date {{ font-size: 12px; color: rgba(255,255,255,0.5); margin-bottom: 2px; }}
-.cf-disc {{ font-size: 10px; color: rgba(255,255,255,0.25); }}
-.deco-circle {{ position: absolute; border-radius: 50%; pointer-events: none; }}
-.dc1 {{ width: 320px; height: 320px; right: -60px; top: 60px; border: 1px solid rgba(192,57,43,0.12); }}
-.dc2 {{ width: 200px; height: 200px; right: 20px; top: 120px; border: 1px solid rgba(192,57,43,0.08); }}
-.dc3 {{ width: 120px; height: 120px; right: 80px; top: 180px; background: rgba(192,57,43,0.06); }}
+}
+.cf-brand { font-size: 14px; font-weight: 700; color: #d4a017; letter-spacing: 1px; }
+.cf-sub { font-size: 10px; color: rgba(255,255,255,0.3); margin-top: 2px; }
+.cf-date { font-size: 12px; color: rgba(255,255,255,0.5); margin-bottom: 2px; }
+.cf-disc { font-size: 10px; color: rgba(255,255,255,0.25); }
+.deco-circle { position: absolute; border-radius: 50%; pointer-events: none; }
+.dc1 { width: 320px; height: 320px; right: -60px; top: 60px; border: 1px solid rgba(192,57,43,0.12); }
+.dc2 { width: 200px; height: 200px; right: 20px; top: 120px; border: 1px solid rgba(192,57,43,0.08); }
+.dc3 { width: 120px; height: 120px; right: 80px; top: 180px; background: rgba(192,57,43,0.06); }
 /* ═══ CONTENT PAGES ═══ */
-.cpage {{
+.cpage {
   width: 210mm; min-height: 297mm; padding: 0;
   page-break-after: always; position: relative; background: #fff;
-}}
-.cpage:last-child {{ page-break-after: auto; }}
-.ph {{
+}
+.cpage:last-child { page-break-after: auto; }
+.ph {
   height: 46px; background: #0f0000;
   display: flex; align-items: center; padding: 0 36px; justify-content: space-between;
   border-bottom: 2px solid #c0392b;
-}}
-.ph-brand {{ font-size: 11px; font-weight: 700; color: #d4a017; letter-spacing: 2px; }}
-.ph-sub {{ font-size: 11px; color: rgba(255,255,255,0.35); letter-spacing: 1px; }}
-.ph-date {{ font-size: 10px; color: rgba(255,255,255,0.25); }}
-.pbody {{ padding: 20px 36px 52px; }}
-.sec-banner {{ display: flex; align-items: stretch; margin-bottom: 20px; border-radius: 6px; overflow: hidden; box-shadow: 0 2px 10px rgba(0,0,0,0.08); }}
-.sec-num {{ width: 56px; display: flex; align-items: center; justify-content: center; flex-direction: column; padding: 12px 0; flex-shrink: 0; background: #c0392b; }}
-.sec-num.orange {{ background: #d35400; }}
-.sec-num.blue {{ background: #1a6fa8; }}
-.sec-num.gold {{ background: #b8860b; }}
-.sec-num.teal {{ background: #148f77; }}
-.sec-num.gray {{ background: #555; }}
-.sec-num-text {{ font-size: 20px; font-weight: 900; color: rgba(255,255,255,0.9); line-height: 1; }}
-.sec-num-label {{ font-size: 8px; color: rgba(255,255,255,0.5); letter-spacing: 1px; margin-top: 2px; }}
-.sec-title {{ flex: 1; padding: 12px 18px; display: flex; flex-direction: column; justify-content: center; background: linear-gradient(135deg, #1a0000 0%, #2a0000 100%); }}
-.sec-title.orange {{ background: linear-gradient(135deg, #1a0800 0%, #2a1000 100%); }}
-.sec-title.blue {{ background: linear-gradient(135deg, #00101a 0%, #001828 100%); }}
-.sec-title.gold {{ background: linear-gradient(135deg, #0f0a00 0%, #1a1200 100%); }}
-.sec-title.teal {{ background: linear-gradient(135deg, #001a14 0%, #002a1e 100%); }}
-.sec-title.gray {{ background: linear-gradient(135deg, #111 0%, #222 100%); }}
-.sec-title h2 {{ font-size: 16px; font-weight: 900; color: #fff; margin-bottom: 2px; }}
-.sec-title p {{ font-size: 10px; color: rgba(255,255,255,0.35); }}
-.vis-h2 {{ font-size: 13px; font-weight: 800; color: #0f2a4a; border-left: 4px solid #c0392b; padding-left: 10px; margin: 16px 0 8px; }}
-.vis-h3 {{ font-size: 12px; font-weight: 700; color: #c0392b; margin: 12px 0 6px; }}
-.vis-p {{ font-size: 12px; color: #2a2a2a; line-height: 1.8; margin-bottom: 8px; text-align: justify; }}
-.vis-ul {{ list-style: none; padding: 0; margin: 4px 0 10px; }}
-.vis-ul li {{ font-size: 11.5px; color: #333; line-height: 1.7; padding: 2px 0 2px 16px; position: relative; }}
-.vis-ul li::before {{ content: "·"; position: absolute; left: 4px; color: #c0392b; font-weight: 900; font-size: 16px; line-height: 1.3; }}
-.vis-table {{ width: 100%; border-collapse: collapse; font-size: 11px; margin: 10px 0; }}
-.vis-table thead tr {{ background: #0f0000; }}
-.vis-table th {{ color: #d4a017; font-weight: 700; padding: 7px 10px; text-align: left; font-size: 10px; letter-spacing: 0.5px; }}
-.vis-table td {{ padding: 6px 10px; border-bottom: 1px solid #f0f0f0; }}
-.vis-table .td-name {{ font-weight: 600; color: #1a1a2e; }}
-.vis-table tr:nth-child(even) td {{ background: #fafafa; }}
-.vis-pmi-bar {{ background: #f0f4ff; border: 1px solid #c8d8f5; border-radius: 4px; padding: 8px 14px; font-size: 11px; color: #1d4ed8; margin-bottom: 14px; }}
-.pfoot {{
+}
+.ph-brand { font-size: 11px; font-weight: 700; color: #d4a017; letter-spacing: 2px; }
+.ph-sub { font-size: 11px; color: rgba(255,255,255,0.35); letter-spacing: 1px; }
+.ph-date { font-size: 10px; color: rgba(255,255,255,0.25); }
+.pbody { padding: 20px 36px 52px; }
+.sec-banner { display: flex; align-items: stretch; margin-bottom: 20px; border-radius: 6px; overflow: hidden; box-shadow: 0 2px 10px rgba(0,0,0,0.08); }
+.sec-num { width: 56px; display: flex; align-items: center; justify-content: center; flex-direction: column; padding: 12px 0; flex-shrink: 0; background: #c0392b; }
+.sec-num.orange { background: #d35400; }
+.sec-num.blue { background: #1a6fa8; }
+.sec-num.gold { background: #b8860b; }
+.sec-num.teal { background: #148f77; }
+.sec-num.gray { background: #555; }
+.sec-num-text { font-size: 20px; font-weight: 900; color: rgba(255,255,255,0.9); line-height: 1; }
+.sec-num-label { font-size: 8px; color: rgba(255,255,255,0.5); letter-spacing: 1px; margin-top: 2px; }
+.sec-title { flex: 1; padding: 12px 18px; display: flex; flex-direction: column; justify-content: center; background: linear-gradient(135deg, #1a0000 0%, #2a0000 100%); }
+.sec-title.orange { background: linear-gradient(135deg, #1a0800 0%, #2a1000 100%); }
+.sec-title.blue { background: linear-gradient(135deg, #00101a 0%, #001828 100%); }
+.sec-title.gold { background: linear-gradient(135deg, #0f0a00 0%, #1a1200 100%); }
+.sec-title.teal { background: linear-gradient(135deg, #001a14 0%, #002a1e 100%); }
+.sec-title.gray { background: linear-gradient(135deg, #111 0%, #222 100%); }
+.sec-title h2 { font-size: 16px; font-weight: 900; color: #fff; margin-bottom: 2px; }
+.sec-title p { font-size: 10px; color: rgba(255,255,255,0.35); }
+.vis-h2 { font-size: 13px; font-weight: 800; color: #0f2a4a; border-left: 4px solid #c0392b; padding-left: 10px; margin: 16px 0 8px; }
+.vis-h3 { font-size: 12px; font-weight: 700; color: #c0392b; margin: 12px 0 6px; }
+.vis-p { font-size: 12px; color: #2a2a2a; line-height: 1.8; margin-bottom: 8px; text-align: justify; }
+.vis-ul { list-style: none; padding: 0; margin: 4px 0 10px; }
+.vis-ul li { font-size: 11.5px; color: #333; line-height: 1.7; padding: 2px 0 2px 16px; position: relative; }
+.vis-ul li::before { content: "·"; position: absolute; left: 4px; color: #c0392b; font-weight: 900; font-size: 16px; line-height: 1.3; }
+.vis-table { width: 100%; border-collapse: collapse; font-size: 11px; margin: 10px 0; }
+.vis-table thead tr { background: #0f0000; }
+.vis-table th { color: #d4a017; font-weight: 700; padding: 7px 10px; text-align: left; font-size: 10px; letter-spacing: 0.5px; }
+.vis-table td { padding: 6px 10px; border-bottom: 1px solid #f0f0f0; }
+.vis-table .td-name { font-weight: 600; color: #1a1a2e; }
+.vis-table tr:nth-child(even) td { background: #fafafa; }
+.vis-pmi-bar { background: #f0f4ff; border: 1px solid #c8d8f5; border-radius: 4px; padding: 8px 14px; font-size: 11px; color: #1d4ed8; margin-bottom: 14px; }
+.pfoot {
   position: absolute; bottom: 0; left: 0; right: 0; height: 30px;
   background: #0f0000; display: flex; align-items: center; padding: 0 36px; justify-content: space-between;
-}}
-.pf-brand {{ font-size: 10px; color: #d4a017; font-weight: 700; letter-spacing: 1px; }}
-.pf-disc {{ font-size: 9px; color: rgba(255,255,255,0.25); }}
-</style>
+}
+.pf-brand { font-size: 10px; color: #d4a017; font-weight: 700; letter-spacing: 1px; }
+.pf-disc { font-size: 9px; color: rgba(255,255,255,0.25); }
+"""
+
+
+# Page scaffold for the v2 report, parsed once at import; the stylesheet is baked in
+_VISUAL_TEMPLATE = string.Template("""<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+<meta charset="UTF-8"/>
+<style>
+""" + _VISUAL_CSS + """</style>
 </head>
 <body>
 
@@ -1269,7 +1406,7 @@ body {{
     <div>
       <div class="push-label">
         <span class="push-tag">链采联盟 · 每日财经推送</span>
-        <span class="push-chain">{date_cn}</span>
+        <span class="push-chain">${date_cn}</span>
       </div>
       <div class="cover-headline">
         <div class="eyebrow">DAILY FINANCIAL &amp; PROCUREMENT INTELLIGENCE</div>
@@ -1281,7 +1418,7 @@ body {{
         </div>
       </div>
       <div class="cover-stats">
-        {market_cards}
+        ${market_cards}
       </div>
       <div class="cover-toc">
         <div class="toc-item"><span class="toc-num">01</span><span class="toc-name">市场概览<br/>宏观经济</span></div>
@@ -1297,7 +1434,7 @@ body {{
       <div class="cf-sub">CHAIN PROCUREMENT ALLIANCE · DAILY FINANCE BRIEFING</div>
     </div>
     <div style="text-align:right;">
-      <div class="cf-date">发布日期：{date_cn} &nbsp;|&nbsp; 生成时间：{generation_time}</div>
+      <div class="cf-date">发布日期：${date_cn} &nbsp;|&nbsp; 生成时间：${generation_time}</div>
       <div class="cf-disc">本简报仅供参考，不构成任何投资或商业决策建议</div>
     </div>
   </div>
@@ -1308,20 +1445,20 @@ body {{
   <div class="ph">
     <span class="ph-brand">链采联盟 · 每日财经推送</span>
     <span class="ph-sub">DAILY FINANCE BRIEFING</span>
-    <span class="ph-date">{report_date}</span>
+    <span class="ph-date">${report_date}</span>
   </div>
   <div class="pbody">
-    {pmi_line}
+    ${pmi_line}
     <div class="sec-banner">
       <div class="sec-num"><span class="sec-num-text">01</span><span class="sec-num-label">MARKET</span></div>
       <div class="sec-title"><h2>市场概览</h2><p>Global Market Overview · Key Indices · Core Themes</p></div>
     </div>
-    {sec1_html}
+    ${sec1_html}
     <div class="sec-banner" style="margin-top:18px;">
       <div class="sec-num orange"><span class="sec-num-text">02</span><span class="sec-num-label">MACRO</span></div>
       <div class="sec-title orange"><h2>宏观经济分析</h2><p>Macro Analysis · Central Banks · Policy Trends</p></div>
     </div>
-    {sec2_html}
+    ${sec2_html}
   </div>
   <div class="pfoot"><span class="pf-brand">链采联盟 · 每日财经信息</span><span class="pf-disc">仅供参考，不构成投资建议</span></div>
 </div>
@@ -1331,19 +1468,19 @@ body {{
   <div class="ph">
     <span class="ph-brand">链采联盟 · 每日财经推送</span>
     <span class="ph-sub">DAILY FINANCE BRIEFING</span>
-    <span class="ph-date">{report_date}</span>
+    <span class="ph-date">${report_date}</span>
   </div>
   <div class="pbody">
     <div class="sec-banner">
       <div class="sec-num blue"><span class="sec-num-text">03</span><span class="sec-num-label">INDUSTRY</span></div>
       <div class="sec-title blue"><h2>行业动态</h2><p>Industry Trends · AI · New Energy · Semiconductors</p></div>
     </div>
-    {sec3_html}
+    ${sec3_html}
     <div class="sec-banner" style="margin-top:18px;">
       <div class="sec-num gold"><span class="sec-num-text">04</span><span class="sec-num-label">PROCURE</span></div>
       <div class="sec-title gold"><h2>采购趋势</h2><p>Procurement · Commodities · Logistics · Supply Chain</p></div>
     </div>
-    {sec4_html}
+    ${sec4_html}
   </div>
   <div class="pfoot"><span class="pf-brand">链采联盟 · 每日财经信息</span><span class="pf-disc">仅供参考，不构成投资建议</span></div>
 </div>
@@ -1353,42 +1490,91 @@ body {{
   <div class="ph">
     <span class="ph-brand">链采联盟 · 每日财经推送</span>
     <span class="ph-sub">DAILY FINANCE BRIEFING</span>
-    <span class="ph-date">{report_date}</span>
+    <span class="ph-date">${report_date}</span>
   </div>
   <div class="pbody">
     <div class="sec-banner">
       <div class="sec-num teal"><span class="sec-num-text">05</span><span class="sec-num-label">STRATEGY</span></div>
       <div class="sec-title teal"><h2>投资策略建议</h2><p>Investment Strategy · Asset Allocation · Risk Warning</p></div>
     </div>
-    {sec5_html}
+    ${sec5_html}
     <div class="sec-banner" style="margin-top:18px;">
       <div class="sec-num gray"><span class="sec-num-text">06</span><span class="sec-num-label">DATA</span></div>
       <div class="sec-title gray"><h2>市场数据附录</h2><p>Market Data Appendix · Real-time Prices</p></div>
     </div>
-    {market_table}
+    ${market_table}
     <div style="margin-top:16px;font-size:10px;color:#aaa;border-top:1px solid #eee;padding-top:10px;">
       数据来源：Bloomberg · FT · WSJ · CNBC · The Economist · Federal Reserve · ECB · BIS · OilPrice · TechCrunch · SCMP · Nikkei Asia · Supply Chain Dive · Spend Matters 等 28+ 权威渠道<br/>
-      报告生成时间：{generation_time} &nbsp;|&nbsp; 本报告仅供参考，不构成投资建议。投资有风险，入市需谨慎。
+      报告生成时间：${generation_time} &nbsp;|&nbsp; 本报告仅供参考，不构成投资建议。投资有风险，入市需谨慎。
     </div>
   </div>
   <div class="pfoot"><span class="pf-brand">链采联盟 · 每日财经信息</span><span class="pf-disc">仅供参考，不构成投资建议</span></div>
 </div>
 
 </body>
-</html>"""
-    return html
+</html>""")
+
+
+def generate_visual_html_report(market_data: dict, generated_content: str, report_date: str, pmi_data: dict = None,
+                                generation_time: str = None, date_cn: str = None) -> str:
+    """Generate the new visually rich PDF-optimized report (v2 - branded cover)."""
+    print("Generating v2 visual HTML report...")
+    if pmi_data is None:
+        pmi_data = {}
+    now = datetime.now()
+    if generation_time is None:
+        generation_time = now.strftime('%Y-%m-%d %H:%M:%S')
+    if date_cn is None:
+        date_cn = now.strftime('%Y年%m月%d日')
+
+    # Extract AI content sections
+    sec1_html = _md_to_html_simple(_extract_section(generated_content, '市场概览'))
+    sec2_html = _md_to_html_simple(_extract_section(generated_content, '宏观经济'))
+    sec3_html = _md_to_html_simple(_extract_section(generated_content, '行业动态'))
+    sec4_html = _md_to_html_simple(_extract_section(generated_content, '采购趋势'))
+    sec5_html = _md_to_html_simple(_extract_section(generated_content, '投资策略'))
+
+    market_cards = _build_market_cards(market_data)
+    market_table = _build_market_summary_table(market_data)
+
+    # PMI summary line
+    pmi_line = ''
+    if pmi_data:
+        pmi_items = [
+            f"{v['name']}: <strong>{v['value']:.1f}</strong>"
+            for v in list(pmi_data.values())[:4]
+        ]
+        pmi_line = f'<div class="vis-pmi-bar">PMI 快览：{" &nbsp;|&nbsp; ".join(pmi_items)}</div>'
+
+    return _VISUAL_TEMPLATE.substitute(
+        date_cn=date_cn,
+        market_cards=market_cards,
+        generation_time=generation_time,
+        report_date=report_date,
+        pmi_line=pmi_line,
+        sec1_html=sec1_html,
+        sec2_html=sec2_html,
+        sec3_html=sec3_html,
+        sec4_html=sec4_html,
+        sec5_html=sec5_html,
+        market_table=market_table,
+    )
 
 
 # ============================================================
 # Main (v8 - Generates BOTH v1 original and v2 visual reports)
 # ============================================================
 def main():
+    # One clock read per run; every date/time string below derives from it
+    now = datetime.now()
+    generation_time = now.strftime('%Y-%m-%d %H:%M:%S')
+    report_date = now.strftime('%Y-%m-%d')
+    date_cn = now.strftime('%Y年%m月%d日')
+
     print("=" * 60)
-    print(f"Daily Financial Report v8 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Daily Financial Report v8 - {generation_time}")
     print("=" * 60)
 
-    report_date = datetime.now().strftime('%Y-%m-%d')
-
     # ── v1 paths (original naming, unchanged) ──
     v1_base = f"investment_research_{report_date}"
     v1_html_path = f"{v1_base}.html"
@@ -1398,40 +1584,53 @@ def main():
     v2_html_path = f"report_visual_{report_date}.html"
     v2_pdf_path  = f"report_visual_{report_date}.pdf"
 
-    # 1. Fetch market data
-    market_data = fetch_market_data()
-    with open("market_data.json", "w", encoding="utf-8") as f:
-        json.dump(market_data, f, ensure_ascii=False, indent=2)
-
-    # 2. Aggregate news from 20+ sources
-    all_news = aggregate_all_news(max_items_per_source=6)
-    with open("news_data.json", "w", encoding="utf-8") as f:
-        json.dump(all_news, f, ensure_ascii=False, indent=2)
+    # 1. Fetch market data, news from 20+ sources and PMI data concurrently
+    #    (independent I/O against Yahoo, the RSS hosts and Trading Economics)
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        f_market = ex.submit(fetch_market_data)
+        f_news = ex.submit(aggregate_all_news, max_items_per_source=6)
+        f_pmi = ex.submit(fetch_pmi_data)
+        market_data, all_news, pmi_data = f_market.result(), f_news.result(), f_pmi.result()
+
+    # orjson writes UTF-8 directly (no ASCII escaping), matching the old ensure_ascii=False output
+    Path("market_data.json").write_bytes(orjson.dumps(market_data, option=orjson.OPT_INDENT_2))
+    Path("news_data.json").write_bytes(orjson.dumps(all_news, option=orjson.OPT_INDENT_2))
+    Path("pmi_data.json").write_bytes(orjson.dumps(pmi_data, option=orjson.OPT_INDENT_2))
     news_text = format_news_for_prompt(all_news)
 
-    # 3. Generate AI analysis (shared by both reports)
-    generated_content = generate_report_content(market_data, news_text)
-    with open("generated_content.md", "w", encoding="utf-8") as f:
-        f.write(generated_content)
-
-    # 4. Fetch PMI data
-    pmi_data = fetch_pmi_data()
-    with open("pmi_data.json", "w", encoding="utf-8") as f:
-        json.dump(pmi_data, f, ensure_ascii=False, indent=2)
-
-    # 5. Render v1 original HTML + PDF
-    html_v1 = generate_html_report(market_data, generated_content, report_date, pmi_data)
-    with open(v1_html_path, "w", encoding="utf-8") as f:
-        f.write(html_v1)
-    print(f"[v1] HTML saved: {v1_html_path}")
-    generate_pdf_from_html(html_v1, v1_pdf_path)
-
-    # 6. Render v2 visual HTML + PDF
-    html_v2 = generate_visual_html_report(market_data, generated_content, report_date, pmi_data)
-    with open(v2_html_path, "w", encoding="utf-8") as f:
-        f.write(html_v2)
-    print(f"[v2] HTML saved: {v2_html_path}")
-    generate_pdf_from_html(html_v2, v2_pdf_path)
+    # 2. Generate AI analysis (shared by both reports)
+    generated_content = generate_report_content(market_data, news_text, date_cn=date_cn)
+    Path("generated_content.md").write_text(generated_content, encoding="utf-8")
+
+    # 3-4. WeasyPrint layout is CPU-bound and the slowest step, so PDFs render in a
+    #      worker process: v1 starts while the v2 HTML is still being built. A single
+    #      worker renders both, so _pdf_font_resources() is built once and reused.
+    with ProcessPoolExecutor(max_workers=1) as pdf_pool:
+        pdf_futures = []
+
+        # 3. Render v1 original HTML + PDF
+        html_v1 = generate_html_report(market_data, generated_content, report_date, pmi_data,
+                                       generation_time=generation_time)
+        Path(v1_html_path).write_text(html_v1, encoding="utf-8")
+        print(f"[v1] HTML saved: {v1_html_path}")
+        if GENERATE_PDF:
+            pdf_futures.append(pdf_pool.submit(generate_pdf_from_html, html_v1, v1_pdf_path))
+
+        # 4. Render v2 visual HTML + PDF
+        html_v2 = generate_visual_html_report(market_data, generated_content, report_date, pmi_data,
+                                              generation_time=generation_time, date_cn=date_cn)
+        Path(v2_html_path).write_text(html_v2, encoding="utf-8")
+        print(f"[v2] HTML saved: {v2_html_path}")
+        if GENERATE_PDF:
+            pdf_futures.append(pdf_pool.submit(generate_pdf_from_html, html_v2, v2_pdf_path))
+
+        # Re-raise any render failure here, as the sequential calls did
+        for future in pdf_futures:
+            future.result()
+
+    if not GENERATE_PDF:
+        print("[PDF] GENERATE_PDF=0, skipped PDF rendering.")
+        v1_pdf_path = v2_pdf_path = None
 
     print("=" * 60)
     print("Both reports generated successfully.")
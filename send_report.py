@@ -13,16 +13,18 @@ Changes from v1:
   - All other logic (WeChat, env vars, fallback) unchanged
 """
 
+import atexit
+import functools
+import itertools
 import os
 import re
-import smtplib
+import time
 import requests
-import json
-import base64
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 
 # ============================================================
@@ -49,29 +51,120 @@ WECHAT_WEBHOOK_URL2   = os.environ.get(
 GITHUB_REPOSITORY     = os.environ.get("GITHUB_REPOSITORY", "")
 GITHUB_PAGES_DOMAIN   = os.environ.get("GITHUB_PAGES_DOMAIN", "")
 
+WECHAT_MARKDOWN_MAX_BYTES = 4096  # WeChat Work markdown "content" limit, in UTF-8 bytes
 
-def get_recipients() -> list:
-    return [r.strip() for r in EMAIL_RECIPIENTS_STR.split(";") if r.strip()]
+# One pooled session for every webhook POST, so calls to qyapi.weixin.qq.com
+# (both groups and the fallback) reuse the same keep-alive TLS connections.
+# Connect errors, 429 and 503 are retried with backoff: each means the message
+# was not accepted. Read errors (read=0) and 500/502/504 are not, since the
+# server may already have delivered it and a retry would post it twice.
+_HTTP = requests.Session()
+_HTTP.headers["Content-Type"] = "application/json"
+_HTTP.mount("https://", HTTPAdapter(
+    pool_connections=4, pool_maxsize=4,
+    max_retries=Retry(total=3, read=0, backoff_factor=0.5,
+                      status_forcelist=[429, 503], allowed_methods=["POST"]),
+))
 
 
-def get_html_public_url(html_filename: str) -> str:
-    """Build the GitHub Pages public URL for the HTML report."""
+@functools.lru_cache(maxsize=1)
+def get_recipients() -> tuple:
+    # EMAIL_RECIPIENTS_STR is read once at import, so the parsed tuple never goes stale
+    return tuple(r for r in map(str.strip, EMAIL_RECIPIENTS_STR.split(";")) if r)
+
+
+def _pages_base_url() -> str:
+    """Resolve the GitHub Pages site root from the environment ("" if unknown)."""
     if GITHUB_PAGES_DOMAIN:
-        return f"https://{GITHUB_PAGES_DOMAIN}/{html_filename}"
+        return f"https://{GITHUB_PAGES_DOMAIN}"
     if GITHUB_REPOSITORY:
         parts = GITHUB_REPOSITORY.split("/")
         if len(parts) == 2:
             owner, repo = parts[0], parts[1]
-            return f"https://{owner}.github.io/{repo}/{html_filename}"
+            return f"https://{owner}.github.io/{repo}"
     return ""
 
 
+# The environment does not change during a run, so the site root is resolved once
+_PAGES_BASE_URL = _pages_base_url()
+
+
+def get_html_public_url(html_filename: str) -> str:
+    """Build the GitHub Pages public URL for the HTML report."""
+    return f"{_PAGES_BASE_URL}/{html_filename}" if _PAGES_BASE_URL else ""
+
+
+# Multiple of 3, so no padding is emitted mid-stream
+_B64_CHUNK = 57 * 1024
+
+
+def read_file_b64(path: str) -> str:
+    """Base64-encode a file chunk by chunk instead of holding the whole raw file in memory."""
+    import base64
+
+    # Appending into one bytearray avoids keeping every encoded chunk alive until a final join
+    buf = bytearray()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_B64_CHUNK), b""):
+            buf += base64.b64encode(chunk)
+    return buf.decode("ascii")
+
+
 # ============================================================
 # NEW: Branded Email HTML Body Builder
 # ============================================================
-def build_email_html(report_date: str, html_public_url: str, v2_pdf_name: str) -> str:
-    """Build a visually rich HTML email body with branded header."""
-    date_cn = datetime.now().strftime('%Y年%m月%d日')
+def build_email_html(report_date: str, html_public_url: str, v2_pdf_name: str = None,
+                     v1_pdf_name: str = None, date_cn: str = None) -> str:
+    """Build a visually rich HTML email body; pass names only for PDFs actually attached."""
+    if date_cn is None:
+        date_cn = datetime.now().strftime('%Y年%m月%d日')
+
+    # Two cards sit side by side with a 4% gutter; a lone card takes the full row
+    card_width = ' width="48%"' if v2_pdf_name and v1_pdf_name else ""
+    pdf_cards = []
+    if v2_pdf_name:
+        pdf_cards.append(f"""
+          <td{card_width} style="background:#fdf8f5;border:1px solid #f0ddd0;border-top:3px solid #c0392b;
+                                  border-radius:4px;padding:14px 16px;">
+            <div style="font-size:11px;font-weight:700;color:#c0392b;letter-spacing:1px;margin-bottom:6px;">
+              📄 精装版（推荐）
+            </div>
+            <div style="font-size:13px;font-weight:700;color:#1a1a1a;margin-bottom:4px;">
+              {v2_pdf_name}
+            </div>
+            <div style="font-size:11px;color:#888;">
+              品牌封面 · 彩色板块 · 视觉优化
+            </div>
+          </td>""")
+    if v1_pdf_name:
+        pdf_cards.append(f"""
+          <td{card_width} style="background:#f5f9ff;border:1px solid #c8dff5;border-top:3px solid #1a6fa8;
+                                  border-radius:4px;padding:14px 16px;">
+            <div style="font-size:11px;font-weight:700;color:#1a6fa8;letter-spacing:1px;margin-bottom:6px;">
+              📋 专业版
+            </div>
+            <div style="font-size:13px;font-weight:700;color:#1a1a1a;margin-bottom:4px;">
+              {v1_pdf_name}
+            </div>
+            <div style="font-size:11px;color:#888;">
+              原始格式 · 数据完整 · 适合存档
+            </div>
+          </td>""")
+
+    if len(pdf_cards) == 2:
+        pdf_intro = "\n        本邮件附有两个版本的 PDF 报告："
+    elif pdf_cards:
+        pdf_intro = "\n        本邮件附有 PDF 报告："
+    else:
+        pdf_intro = ""
+    pdf_section = ""
+    if pdf_cards:
+        card_row = '\n          <td width="4%"></td>'.join(pdf_cards)
+        pdf_section = f"""
+      <table width="100%" cellpadding="0" cellspacing="0" style="margin-bottom:20px;">
+        <tr>{card_row}
+        </tr>
+      </table>"""
     link_section = ""
     if html_public_url:
         link_section = f"""
@@ -130,38 +223,8 @@ def build_email_html(report_date: str, html_public_url: str, v2_pdf_name: str) -
     <td style="padding:28px 32px 8px;">
       <p style="font-size:14px;color:#333;line-height:1.8;margin:0 0 16px;">
         您好，<br/>
-        <strong>链采联盟每日财经信息</strong>已生成，请查阅本期简报。
-        本邮件附有两个版本的 PDF 报告：
-      </p>
-      <table width="100%" cellpadding="0" cellspacing="0" style="margin-bottom:20px;">
-        <tr>
-          <td width="48%" style="background:#fdf8f5;border:1px solid #f0ddd0;border-top:3px solid #c0392b;
-                                  border-radius:4px;padding:14px 16px;">
-            <div style="font-size:11px;font-weight:700;color:#c0392b;letter-spacing:1px;margin-bottom:6px;">
-              📄 精装版（推荐）
-            </div>
-            <div style="font-size:13px;font-weight:700;color:#1a1a1a;margin-bottom:4px;">
-              {v2_pdf_name}
-            </div>
-            <div style="font-size:11px;color:#888;">
-              品牌封面 · 彩色板块 · 视觉优化
-            </div>
-          </td>
-          <td width="4%"></td>
-          <td width="48%" style="background:#f5f9ff;border:1px solid #c8dff5;border-top:3px solid #1a6fa8;
-                                  border-radius:4px;padding:14px 16px;">
-            <div style="font-size:11px;font-weight:700;color:#1a6fa8;letter-spacing:1px;margin-bottom:6px;">
-              📋 专业版
-            </div>
-            <div style="font-size:13px;font-weight:700;color:#1a1a1a;margin-bottom:4px;">
-              investment_research_{report_date}.pdf
-            </div>
-            <div style="font-size:11px;color:#888;">
-              原始格式 · 数据完整 · 适合存档
-            </div>
-          </td>
-        </tr>
-      </table>
+        <strong>链采联盟每日财经信息</strong>已生成，请查阅本期简报。{pdf_intro}
+      </p>{pdf_section}
       {link_section}
     </td>
   </tr>
@@ -249,53 +312,66 @@ def build_email_html(report_date: str, html_public_url: str, v2_pdf_name: str) -
 # ============================================================
 # SendGrid Sending (v2 - dual PDF attachments)
 # ============================================================
-def send_via_sendgrid(
-    v1_html_path: str, v1_pdf_path: str,
-    v2_pdf_path: str,
-    report_date: str, html_public_url: str
-) -> bool:
+@functools.lru_cache(maxsize=1)
+def _get_sg():
+    """One SendGrid client per process, so its HTTP session to api.sendgrid.com is reused."""
+    from sendgrid import SendGridAPIClient
+
+    return SendGridAPIClient(SENDGRID_API_KEY)
+
+
+# Only statuses that mean "not accepted"; a 500/502/504 may arrive after SendGrid
+# queued the mail, and retrying would email every recipient twice
+_SG_RETRY_STATUSES = {429, 503}
+
+
+def _sg_send_with_retry(message, attempts: int = 3, backoff: float = 0.5):
+    """Retry transient SendGrid errors in place before falling back to Gmail."""
+    # The SendGrid SDK talks through urllib, not requests, so there is no
+    # adapter to mount a urllib3 Retry on; back off by hand instead
+    from python_http_client.exceptions import HTTPError
+
+    for attempt in range(attempts):
+        try:
+            return _get_sg().send(message)
+        except HTTPError as e:
+            if e.status_code not in _SG_RETRY_STATUSES or attempt == attempts - 1:
+                raise
+            print(f"[SendGrid] HTTP {e.status_code}, retrying in {backoff * 2 ** attempt:.1f}s...")
+        time.sleep(backoff * 2 ** attempt)
+
+
+def send_via_sendgrid(email_html: str, attachments: list, report_date: str) -> bool:
     if not SENDGRID_API_KEY:
         print("SendGrid API key not set, skipping SendGrid.")
         return False
     try:
-        from sendgrid import SendGridAPIClient
         from sendgrid.helpers.mail import (
             Mail, Attachment, FileContent, FileName,
             FileType, Disposition, To, From
         )
         recipients = get_recipients()
-        v2_pdf_name = os.path.basename(v2_pdf_path)
-        email_html = build_email_html(report_date, html_public_url, v2_pdf_name)
 
+        # is_multiple=True gives every recipient their own personalization, so nobody sees
+        # the rest of the list; it is still one API call with the attachments sent once
         message = Mail(
             from_email=From(EMAIL_FROM_ADDR, EMAIL_FROM_NAME),
             to_emails=[To(r) for r in recipients],
             subject=f"【链采联盟】每日财经信息 - {report_date}",
-            html_content=email_html
+            html_content=email_html,
+            is_multiple=True
         )
 
-        # Attach v2 visual PDF (primary)
-        with open(v2_pdf_path, "rb") as f:
-            pdf2_b64 = base64.b64encode(f.read()).decode()
-        message.add_attachment(Attachment(
-            FileContent(pdf2_b64),
-            FileName(v2_pdf_name),
-            FileType("application/pdf"),
-            Disposition("attachment")
-        ))
-
-        # Attach v1 original PDF (secondary)
-        with open(v1_pdf_path, "rb") as f:
-            pdf1_b64 = base64.b64encode(f.read()).decode()
-        message.add_attachment(Attachment(
-            FileContent(pdf1_b64),
-            FileName(os.path.basename(v1_pdf_path)),
-            FileType("application/pdf"),
-            Disposition("attachment")
-        ))
-
-        sg = SendGridAPIClient(SENDGRID_API_KEY)
-        response = sg.send(message)
+        # v2 visual PDF first (primary), then v1 original PDF (secondary)
+        for pdf_name, pdf_b64 in attachments:
+            message.add_attachment(Attachment(
+                FileContent(pdf_b64),
+                FileName(pdf_name),
+                FileType("application/pdf"),
+                Disposition("attachment")
+            ))
+
+        response = _sg_send_with_retry(message)
         if response.status_code in (200, 202):
             print(f"[SendGrid] Email sent to: {', '.join(recipients)}")
             return True
@@ -310,114 +386,233 @@ def send_via_sendgrid(
 # ============================================================
 # Gmail SMTP Sending (v2 - dual PDF attachments + branded body)
 # ============================================================
-def send_via_gmail_smtp(
-    v1_html_path: str, v1_pdf_path: str,
-    v2_pdf_path: str,
-    report_date: str, html_public_url: str
-) -> bool:
+def _mime_b64_lines(b64: str) -> str:
+    """Wrap a base64 string into 76-column lines, as email.encoders.encode_base64 does."""
+    return "".join(f"{b64[i:i + 76]}\n" for i in range(0, len(b64), 76))
+
+
+_smtp_conn = None
+
+
+def _close_smtp():
+    """Politely end the cached SMTP session, if any."""
+    global _smtp_conn
+    if _smtp_conn is None:
+        return
+    import smtplib
+
+    try:
+        _smtp_conn.quit()
+    except (smtplib.SMTPException, OSError):
+        _smtp_conn.close()
+    _smtp_conn = None
+
+
+atexit.register(_close_smtp)
+
+
+def _get_smtp():
+    """Return a logged-in Gmail connection, reusing the cached one while NOOP says it is alive."""
+    global _smtp_conn
+    import smtplib
+
+    if _smtp_conn is not None:
+        try:
+            if _smtp_conn.noop()[0] == 250:
+                return _smtp_conn
+        except (smtplib.SMTPException, OSError):
+            pass
+        _close_smtp()
+    # Implicit TLS on 465 skips the EHLO/STARTTLS round trip of port 587
+    server = smtplib.SMTP_SSL("smtp.gmail.com", 465)
+    try:
+        server.login(GMAIL_USER, GMAIL_APP_PASSWORD)
+    except Exception:
+        # Not cached yet, so nothing else would ever close this socket
+        server.close()
+        raise
+    _smtp_conn = server
+    return server
+
+
+def send_via_gmail_smtp(email_html: str, attachments: list, report_date: str) -> bool:
     if not GMAIL_APP_PASSWORD:
         print("Gmail app password not set, skipping Gmail SMTP.")
         return False
+    from email.message import EmailMessage, MIMEPart
+    from email.policy import SMTP
+
     recipients = get_recipients()
-    v2_pdf_name = os.path.basename(v2_pdf_path)
-    email_html = build_email_html(report_date, html_public_url, v2_pdf_name)
 
-    msg = MIMEMultipart("mixed")
+    # SMTP policy builds the message with CRLF line endings, as sent on the wire
+    msg = EmailMessage(policy=SMTP)
     msg["Subject"] = f"【链采联盟】每日财经信息 - {report_date}"
     msg["From"] = f"{EMAIL_FROM_NAME} <{GMAIL_USER}>"
     msg["To"] = ", ".join(recipients)
-    msg.attach(MIMEText(email_html, "html", "utf-8"))
-
-    # Attach v2 visual PDF (primary - listed first)
-    with open(v2_pdf_path, "rb") as f:
-        pdf2_data = f.read()
-    part2 = MIMEBase("application", "octet-stream")
-    part2.set_payload(pdf2_data)
-    encoders.encode_base64(part2)
-    part2.add_header("Content-Disposition", "attachment", filename=v2_pdf_name)
-    msg.attach(part2)
-
-    # Attach v1 original PDF (secondary)
-    with open(v1_pdf_path, "rb") as f:
-        pdf1_data = f.read()
-    part1 = MIMEBase("application", "octet-stream")
-    part1.set_payload(pdf1_data)
-    encoders.encode_base64(part1)
-    part1.add_header(
-        "Content-Disposition", "attachment",
-        filename=f"investment_research_{report_date}.pdf"
-    )
-    msg.attach(part1)
+    msg.set_content(email_html, subtype="html")
+    msg.make_mixed()
+
+    # v2 visual PDF first (primary), then v1 original PDF (secondary).
+    # The PDFs arrive already base64-encoded, so they are attached as-is rather
+    # than through add_attachment(), which would encode the bytes again.
+    for pdf_name, pdf_b64 in attachments:
+        part = MIMEPart(policy=SMTP)
+        part["Content-Type"] = "application/pdf"
+        part["Content-Transfer-Encoding"] = "base64"
+        part["Content-Disposition"] = "attachment"
+        part.set_param("filename", pdf_name, header="Content-Disposition")
+        part.set_payload(_mime_b64_lines(pdf_b64))
+        msg.attach(part)
 
     try:
-        with smtplib.SMTP("smtp.gmail.com", 587) as server:
-            server.ehlo()
-            server.starttls()
-            server.login(GMAIL_USER, GMAIL_APP_PASSWORD)
-            server.sendmail(GMAIL_USER, recipients, msg.as_string())
+        _get_smtp().send_message(msg, GMAIL_USER, recipients)
         print(f"[Gmail SMTP] Email sent to: {', '.join(recipients)}")
         return True
     except Exception as e:
         print(f"[Gmail SMTP] Error: {e}")
+        # Never hand a connection in an unknown state to the next send
+        _close_smtp()
         return False
 
 
 def send_email(
     v1_html_path: str, v1_pdf_path: str,
     v2_pdf_path: str,
-    report_date: str, html_public_url: str
+    report_date: str, html_public_url: str,
+    date_cn: str = None
 ) -> bool:
     print(f"\n--- Sending Email (v2 dual-PDF) ---")
+    if not (SENDGRID_API_KEY or GMAIL_APP_PASSWORD):
+        print("Neither SendGrid nor Gmail SMTP is configured, skipping email.")
+        return False
+
+    # Attachments and body are built once and shared by the SendGrid attempt and the
+    # Gmail fallback. PDFs may be absent (generate_report ran with GENERATE_PDF=0);
+    # those present are read and encoded a single time, and the body lists only them.
+    attachments = []
+    for pdf_path in (v2_pdf_path, v1_pdf_path):
+        if not pdf_path:
+            continue
+        if os.path.exists(pdf_path):
+            attachments.append((os.path.basename(pdf_path), read_file_b64(pdf_path)))
+        else:
+            print(f"[WARN] PDF not found, sending without it: {pdf_path}")
+    attached = {name for name, _ in attachments}
+    v2_pdf_name = os.path.basename(v2_pdf_path) if v2_pdf_path else None
+    v1_pdf_name = os.path.basename(v1_pdf_path) if v1_pdf_path else None
+    email_html = build_email_html(
+        report_date, html_public_url,
+        v2_pdf_name if v2_pdf_name in attached else None,
+        v1_pdf_name if v1_pdf_name in attached else None,
+        date_cn=date_cn,
+    )
+
     if SENDGRID_API_KEY:
-        success = send_via_sendgrid(
-            v1_html_path, v1_pdf_path, v2_pdf_path, report_date, html_public_url
-        )
+        success = send_via_sendgrid(email_html, attachments, report_date)
         if success:
             return True
         print("SendGrid failed, trying Gmail SMTP fallback...")
-    return send_via_gmail_smtp(
-        v1_html_path, v1_pdf_path, v2_pdf_path, report_date, html_public_url
-    )
+    return send_via_gmail_smtp(email_html, attachments, report_date)
 
 
 # ============================================================
 # Helpers for WeChat content extraction (unchanged from v1)
 # ============================================================
-def extract_section(md_text: str, section_title: str, max_chars: int = 400) -> str:
-    pattern = rf'## [一二三四五六七八九十\d]+[、.．]?\s*{re.escape(section_title)}.*?(?=\n## |\Z)'
-    match = re.search(pattern, md_text, re.DOTALL)
-    if match:
-        content = match.group(0)
-        lines = content.split('\n')
-        body_lines = []
-        for line in lines[1:]:
-            stripped = line.strip()
-            if stripped.startswith('###') or stripped.startswith('---'):
-                continue
-            if stripped:
-                clean = re.sub(r'\*\*(.+?)\*\*', r'\1', stripped)
-                clean = re.sub(r'\*(.+?)\*', r'\1', clean)
-                body_lines.append(clean)
-        body = ' '.join(body_lines)
-        return body[:max_chars].rstrip() + ('…' if len(body) > max_chars else '')
-    return ""
+_BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+_ITAL_RE = re.compile(r'\*(.+?)\*')
+
+
+# Numbered section heading, e.g. "## 二、宏观经济分析（800字）"; group 1 is the title text
+_SECTION_HEAD_RE = re.compile(r'^## [一二三四五六七八九十\d]+[、.．]?[^\S\n]*(.*)$', re.M)
+
+
+def _split_markdown_sections(md_text: str) -> dict:
+    """Index every numbered "## " section in one pass: {heading title: section text}.
 
+    Each section runs from its heading line up to the next "## " heading, and the
+    first occurrence of a title wins.
+    """
+    sections = {}
+    for m in _SECTION_HEAD_RE.finditer(md_text):
+        end = md_text.find('\n## ', m.end())
+        sections.setdefault(m.group(1), md_text[m.start():end if end != -1 else len(md_text)])
+    return sections
 
-def fmt_market_row(name: str, val: dict) -> str:
-    pct = val.get("pct", "N/A") if isinstance(val, dict) else "N/A"
-    price = val.get("price", "N/A") if isinstance(val, dict) else "N/A"
-    if isinstance(pct, str) and "+" in pct:
-        arrow = "🔺"
-    elif isinstance(pct, str) and "-" in pct:
-        arrow = "🔻"
+
+def section_summary(sections: dict, section_title: str, max_chars: int = 400) -> str:
+    """Plain-text body of the first section whose title starts with section_title."""
+    for title, content in sections.items():
+        if title.startswith(section_title):
+            break
     else:
-        arrow = "➡️"
-    return f"{arrow} **{name}**: {price}  ({pct})"
+        return ""
+    body_lines = []
+    for line in content.split('\n')[1:]:
+        stripped = line.strip()
+        if stripped.startswith('###') or stripped.startswith('---'):
+            continue
+        if stripped:
+            clean = _BOLD_RE.sub(r'\1', stripped)
+            clean = _ITAL_RE.sub(r'\1', clean)
+            body_lines.append(clean)
+    body = ' '.join(body_lines)
+    return body[:max_chars].rstrip() + ('…' if len(body) > max_chars else '')
+
+
+def extract_section(md_text: str, section_title: str, max_chars: int = 400) -> str:
+    return section_summary(_split_markdown_sections(md_text), section_title, max_chars)
+
+
+_ARROWS = {"+": "🔺", "-": "🔻"}
+
+
+@dataclass(slots=True)
+class MarketRow:
+    price: str = "N/A"
+    pct: str = "N/A"
+    arrow: str = "➡️"
+
+
+def normalize_market_rows(group: dict) -> dict:
+    """Validate one market_data.json group once, so rendering is plain attribute access."""
+    rows = {}
+    for name, val in group.items():
+        if not isinstance(val, dict):
+            rows[name] = MarketRow()
+            continue
+        pct = val.get("pct", "N/A")
+        # pct is formatted with an explicit sign ("+0.53%"), so its first char picks the arrow
+        arrow = _ARROWS.get(pct[:1] if isinstance(pct, str) else "", "➡️")
+        rows[name] = MarketRow(val.get("price", "N/A"), pct, arrow)
+    return rows
+
+
+def fmt_market_row(name: str, row: MarketRow) -> str:
+    return f"{row.arrow} **{name}**: {row.price}  ({row.pct})"
 
 
 # ============================================================
 # WeChat Work Webhook (unchanged from v1)
 # ============================================================
+# Static scaffolding of the WeChat messages, filled in with str.format per send
+_WECHAT_HEADER_TEMPLATE = (
+    "# 📈 链采联盟-每日财经信息  {date}\n"
+    "> 数据来源：Bloomberg · FT · WSJ · CNBC · The Economist · Fed · ECB · BIS · OilPrice · "
+    "TechCrunch · SCMP · Nikkei Asia · Supply Chain Dive · Spend Matters 等 **28+ 权威渠道**"
+)
+_WECHAT_FOOTER_TEMPLATE = (
+    "\n---\n{link}\n\n"
+    "_⚠️ 本报告仅供参考，不构成投资建议。投资有风险，入市需谨慎。_"
+)
+_WECHAT_FALLBACK_TEMPLATE = (
+    "# 📈 链采联盟-每日财经信息  {date}\n\n"
+    "**主要指数**\n{indices}\n\n"
+    "**大宗商品**\n{commodities}\n\n"
+    "{link}\n\n"
+    "_本报告仅供参考，不构成投资建议。_"
+)
+
+
 def send_wechat_work(
     html_public_url: str,
     report_date: str,
@@ -430,8 +625,8 @@ def send_wechat_work(
         return False
 
     try:
-        with open(market_data_path, "r", encoding="utf-8") as f:
-            market_data = json.load(f)
+        with open(market_data_path, "rb") as f:
+            market_data = orjson.loads(f.read())
     except Exception:
         market_data = {"indices": {}, "commodities": {}, "forex": {}}
 
@@ -441,20 +636,21 @@ def send_wechat_work(
     except Exception:
         content_md = ""
 
-    indices    = market_data.get("indices", {})
-    commodities = market_data.get("commodities", {})
-    forex      = market_data.get("forex", {})
+    indices    = normalize_market_rows(market_data.get("indices", {}))
+    commodities = normalize_market_rows(market_data.get("commodities", {}))
+    forex      = normalize_market_rows(market_data.get("forex", {}))
 
-    indices_lines   = "\n".join([fmt_market_row(k, v) for k, v in indices.items()])
-    commodity_lines = "\n".join([fmt_market_row(k, v) for k, v in commodities.items()])
-    forex_lines     = "\n".join([fmt_market_row(k, v) for k, v in forex.items()])
+    indices_lines   = "\n".join(fmt_market_row(k, v) for k, v in indices.items())
+    commodity_lines = "\n".join(fmt_market_row(k, v) for k, v in commodities.items())
+    forex_lines     = "\n".join(fmt_market_row(k, v) for k, v in forex.items())
 
-    market_overview     = extract_section(content_md, "市场概览", 300)
-    macro_summary       = extract_section(content_md, "宏观经济分析", 350)
-    industry_summary    = extract_section(content_md, "行业动态", 350)
-    company_summary     = extract_section(content_md, "公司聚焦", 300)
-    procurement_summary = extract_section(content_md, "采购趋势", 400)
-    strategy_summary    = extract_section(content_md, "投资策略建议", 300)
+    sections = _split_markdown_sections(content_md)
+    market_overview     = section_summary(sections, "市场概览", 300)
+    macro_summary       = section_summary(sections, "宏观经济分析", 350)
+    industry_summary    = section_summary(sections, "行业动态", 350)
+    company_summary     = section_summary(sections, "公司聚焦", 300)
+    procurement_summary = section_summary(sections, "采购趋势", 400)
+    strategy_summary    = section_summary(sections, "投资策略建议", 300)
 
     link_line = (
         f"📎 [**点击查看完整报告 →**]({html_public_url})"
@@ -462,12 +658,7 @@ def send_wechat_work(
         "📧 完整报告已通过邮件发送（含 PDF 附件）"
     )
 
-    message_parts = []
-    message_parts.append(
-        f"# 📈 链采联盟-每日财经信息  {report_date}\n"
-        f"> 数据来源：Bloomberg · FT · WSJ · CNBC · The Economist · Fed · ECB · BIS · OilPrice · "
-        f"TechCrunch · SCMP · Nikkei Asia · Supply Chain Dive · Spend Matters 等 **28+ 权威渠道**"
-    )
+    message_parts = [_WECHAT_HEADER_TEMPLATE.format(date=report_date)]
     if market_overview:
         message_parts.append(f"\n## 一、市场概览\n{market_overview}")
     message_parts.append(f"\n## 二、主要股票指数\n{indices_lines}")
@@ -483,53 +674,57 @@ def send_wechat_work(
         message_parts.append(f"\n## 八、采购趋势\n{procurement_summary}")
     if strategy_summary:
         message_parts.append(f"\n## 九、投资策略建议\n{strategy_summary}")
-    message_parts.append(
-        f"\n---\n{link_line}\n\n"
-        f"_⚠️ 本报告仅供参考，不构成投资建议。投资有风险，入市需谨慎。_"
-    )
+    message_parts.append(_WECHAT_FOOTER_TEMPLATE.format(link=link_line))
 
     full_message = "\n".join(message_parts)
-    if len(full_message) > 4000:
-        full_message = full_message[:3950] + f"\n\n…（内容已截断）\n{link_line}"
-
-    payload = {"msgtype": "markdown", "markdown": {"content": full_message}}
+    # The limit counts UTF-8 bytes (3 per Chinese character), not characters
+    encoded = full_message.encode("utf-8")
+    if len(encoded) > WECHAT_MARKDOWN_MAX_BYTES:
+        tail = f"\n\n…（内容已截断）\n{link_line}"
+        budget = WECHAT_MARKDOWN_MAX_BYTES - len(tail.encode("utf-8"))
+        # errors="ignore" drops a character split by the byte cut
+        full_message = encoded[:budget].decode("utf-8", errors="ignore") + tail
+
+    # Serialized once (UTF-8, no \u escapes) and shared by every group POST;
+    # the session already sends Content-Type: application/json
+    payload = orjson.dumps({"msgtype": "markdown", "markdown": {"content": full_message}})
 
-    success = False
     urls_to_send = [u for u in [WECHAT_WEBHOOK_URL, WECHAT_WEBHOOK_URL2] if u]
-    for idx, wechat_url in enumerate(urls_to_send, 1):
+
+    def post_to_group(idx: int, wechat_url: str) -> bool:
         try:
-            resp = requests.post(wechat_url, json=payload, timeout=10)
+            resp = _HTTP.post(wechat_url, data=payload, timeout=10)
             resp.raise_for_status()
             result = resp.json()
             if result.get("errcode") == 0:
                 print(f"[WeChat Work] Message sent successfully to group {idx}.")
-                success = True
-            else:
-                print(f"[WeChat Work] API error (group {idx}): {result}")
-                if result.get("errcode") == 45009:
-                    _send_wechat_fallback_url(wechat_url, html_public_url, report_date, indices, commodities)
+                return True
+            print(f"[WeChat Work] API error (group {idx}): {result}")
+            if result.get("errcode") == 45009:
+                _send_wechat_fallback_url(wechat_url, html_public_url, report_date, indices, commodities)
         except Exception as e:
             print(f"[WeChat Work] Error (group {idx}): {e}")
-    return success
+        return False
+
+    # The group webhooks are independent; post to all of them at once
+    with ThreadPoolExecutor(max_workers=len(urls_to_send)) as ex:
+        results = list(ex.map(post_to_group, range(1, len(urls_to_send) + 1), urls_to_send))
+    return any(results)
 
 
 def _send_wechat_fallback_url(wechat_url, html_public_url, report_date, indices, commodities):
-    indices_lines = "\n".join([fmt_market_row(k, v) for k, v in list(indices.items())[:6]])
-    commodity_lines = "\n".join([fmt_market_row(k, v) for k, v in list(commodities.items())[:4]])
+    indices_lines = "\n".join(fmt_market_row(k, v) for k, v in itertools.islice(indices.items(), 6))
+    commodity_lines = "\n".join(fmt_market_row(k, v) for k, v in itertools.islice(commodities.items(), 4))
     link_line = (
         f"📎 [**点击查看完整报告 →**]({html_public_url})"
         if html_public_url else "📧 完整报告已发送至邮箱"
     )
-    msg = (
-        f"# 📈 链采联盟-每日财经信息  {report_date}\n\n"
-        f"**主要指数**\n{indices_lines}\n\n"
-        f"**大宗商品**\n{commodity_lines}\n\n"
-        f"{link_line}\n\n"
-        f"_本报告仅供参考，不构成投资建议。_"
+    msg = _WECHAT_FALLBACK_TEMPLATE.format(
+        date=report_date, indices=indices_lines, commodities=commodity_lines, link=link_line
     )
-    payload = {"msgtype": "markdown", "markdown": {"content": msg}}
+    payload = orjson.dumps({"msgtype": "markdown", "markdown": {"content": msg}})
     try:
-        resp = requests.post(wechat_url, json=payload, timeout=10)
+        resp = _HTTP.post(wechat_url, data=payload, timeout=10)
         result = resp.json()
         if result.get("errcode") == 0:
             print("[WeChat Work] Fallback message sent.")
@@ -543,7 +738,10 @@ def _send_wechat_fallback_url(wechat_url, html_public_url, report_date, indices,
 # Main (v2 - reads both v1 and v2 PDF paths)
 # ============================================================
 if __name__ == "__main__":
-    report_date = datetime.now().strftime("%Y-%m-%d")
+    # One clock read per run, so the subject, body and file names agree across midnight
+    now = datetime.now()
+    report_date = now.strftime("%Y-%m-%d")
+    date_cn = now.strftime("%Y年%m月%d日")
 
     v1_base     = f"investment_research_{report_date}"
     v1_html_path = f"{v1_base}.html"
@@ -555,5 +753,12 @@ if __name__ == "__main__":
     html_public_url = get_html_public_url(v1_html_path)
     print(f"HTML public URL: {html_public_url or '(not set)'}")
 
-    send_email(v1_html_path, v1_pdf_path, v2_pdf_path, report_date, html_public_url)
-    send_wechat_work(html_public_url, report_date)
+    # Email and WeChat share no state; run both deliveries concurrently
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        email_future = ex.submit(
+            send_email, v1_html_path, v1_pdf_path, v2_pdf_path, report_date, html_public_url,
+            date_cn=date_cn
+        )
+        wechat_future = ex.submit(send_wechat_work, html_public_url, report_date)
+        email_future.result()
+        wechat_future.result()